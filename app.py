@@ -2,9 +2,14 @@ import streamlit as st
 from page.schema_converter import schema_converter_page
 from page.data_generator_page import data_generator_page
 from config.app_config import setup_page_config, load_custom_css
-from services.llm_service import LLMService
+from services.llm_service import get_llm_service
 from config.llm_config import LLMConfig
 
+@st.cache_data(show_spinner=False)
+def default_model_config():
+    """Return a copy of the default model configuration."""
+    return LLMConfig.DEFAULT_CONFIG.copy()
+
 def main():
     # Setup page configuration
     setup_page_config()
@@ -28,11 +33,11 @@ def main():
     if 'generation_complete' not in st.session_state:
         st.session_state.generation_complete = False
     
-    if 'llm_service' not in st.session_state: # Ensure LLMService is initialized
-        st.session_state.llm_service = LLMService()
+    # LLMService is shared process-wide so the client is only set up once
+    st.session_state.llm_service = get_llm_service()
     
     if 'model_config' not in st.session_state: # Ensure model_config is initialized
-        st.session_state.model_config = LLMConfig.DEFAULT_CONFIG.copy()
+        st.session_state.model_config = default_model_config()
     
     # Tab navigation
     tab1, tab2 = st.tabs(["Schema Converter", "Data Generator"])
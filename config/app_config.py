@@ -1,4 +1,5 @@
 import streamlit as st
+from typing import Final
 
 def setup_page_config():
     """Setup Streamlit page configuration."""
@@ -9,9 +10,8 @@ def setup_page_config():
         initial_sidebar_state="expanded"
     )
 
-def load_custom_css():
-    """Load custom CSS styles."""
-    st.markdown("""
+# Custom CSS, built once per process instead of on every rerun.
+_CSS: Final[str] = """
     <style>
         .main-header {
             text-align: center;
@@ -88,4 +88,13 @@ def load_custom_css():
             color: white;
         }
     </style>
-    """, unsafe_allow_html=True)
\ No newline at end of file
+    """
+
+@st.cache_data(show_spinner=False)
+def _css() -> str:
+    """Return the custom CSS block."""
+    return _CSS
+
+def load_custom_css():
+    """Load custom CSS styles."""
+    st.markdown(_css(), unsafe_allow_html=True)
\ No newline at end of file
@@ -0,0 +1,20 @@
+-- HR Management System Schema
+CREATE TABLE employees (
+    employee_id INT PRIMARY KEY AUTO_INCREMENT,
+    first_name VARCHAR(50) NOT NULL,
+    last_name VARCHAR(50) NOT NULL,
+    email VARCHAR(100) UNIQUE NOT NULL,
+    hire_date DATE NOT NULL,
+    salary DECIMAL(10,2),
+    department VARCHAR(50),
+    position VARCHAR(100),
+    is_active BOOLEAN DEFAULT TRUE
+);
+
+CREATE TABLE departments (
+    department_id INT PRIMARY KEY AUTO_INCREMENT,
+    name VARCHAR(100) NOT NULL,
+    manager_id INT,
+    budget DECIMAL(12,2),
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,20 @@
+-- Student Management System Schema
+CREATE TABLE students (
+    student_id INT PRIMARY KEY AUTO_INCREMENT,
+    first_name VARCHAR(50) NOT NULL,
+    last_name VARCHAR(50) NOT NULL,
+    email VARCHAR(100) UNIQUE NOT NULL,
+    date_of_birth DATE,
+    enrollment_date DATE NOT NULL,
+    gpa DECIMAL(3,2),
+    is_active BOOLEAN DEFAULT TRUE
+);
+
+CREATE TABLE courses (
+    course_id INT PRIMARY KEY AUTO_INCREMENT,
+    course_code VARCHAR(10) UNIQUE NOT NULL,
+    course_name VARCHAR(200) NOT NULL,
+    credits INT NOT NULL,
+    instructor VARCHAR(100),
+    semester VARCHAR(20)
+);
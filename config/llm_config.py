@@ -1,4 +1,6 @@
-from typing import Dict, List, Any
+import functools
+import importlib.resources
+from typing import Dict, Any, Tuple
 
 class LLMConfig:
     """Configuration class for LLM settings and options."""
@@ -31,6 +33,10 @@ class LLMConfig:
         }
     }
     
+    # Lookups derived from AVAILABLE_MODELS once at class creation
+    _NAME_TO_ID = {info["name"]: model_id for model_id, info in AVAILABLE_MODELS.items()}
+    MODEL_NAMES = tuple(info["name"] for info in AVAILABLE_MODELS.values())
+    
     # Default configuration
     DEFAULT_CONFIG = {
         "model": "gemini-2.0-flash-001",
@@ -74,101 +80,81 @@ INSTRUCTIONS:
 INPUT SCHEMA/DESCRIPTION/SQL:
 {input_schema_or_sql}
 """
+    # Everything before the input block is identical for every request in a dialect. It is
+    # sent as the system instruction so the provider can reuse its cached prefix.
+    _INPUT_HEADER = "INPUT SCHEMA/DESCRIPTION/SQL:\n"
+    _SYSTEM_PARTS = tuple(
+        SCHEMA_CONVERSION_PROMPT.split(_INPUT_HEADER)[0].strip().split("{output_format}")
+    )
+    
+    # Static instructions for schema improvement suggestions
+    IMPROVEMENT_SYSTEM_PROMPT = """
+Analyze the SQL schema you are given and provide improvement suggestions.
 
-    # Example schemas for user reference
-    EXAMPLE_SCHEMAS = {
-        "E-commerce": """
--- E-commerce Database Schema
-CREATE TABLE customers (
-    customer_id INT PRIMARY KEY AUTO_INCREMENT,
-    first_name VARCHAR(50) NOT NULL,
-    last_name VARCHAR(50) NOT NULL,
-    email VARCHAR(100) UNIQUE NOT NULL,
-    phone VARCHAR(20),
-    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-);
-
-CREATE TABLE products (
-    product_id INT PRIMARY KEY AUTO_INCREMENT,
-    name VARCHAR(200) NOT NULL,
-    description TEXT,
-    price DECIMAL(10,2) NOT NULL,
-    stock_quantity INT DEFAULT 0,
-    category VARCHAR(50),
-    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-);
-
-CREATE TABLE orders (
-    order_id INT PRIMARY KEY AUTO_INCREMENT,
-    customer_id INT NOT NULL,
-    order_date DATETIME DEFAULT CURRENT_TIMESTAMP,
-    total_amount DECIMAL(10,2) NOT NULL,
-    status VARCHAR(20) DEFAULT 'pending'
-);
-""",
-        "HR Management": """
--- HR Management System Schema
-CREATE TABLE employees (
-    employee_id INT PRIMARY KEY AUTO_INCREMENT,
-    first_name VARCHAR(50) NOT NULL,
-    last_name VARCHAR(50) NOT NULL,
-    email VARCHAR(100) UNIQUE NOT NULL,
-    hire_date DATE NOT NULL,
-    salary DECIMAL(10,2),
-    department VARCHAR(50),
-    position VARCHAR(100),
-    is_active BOOLEAN DEFAULT TRUE
-);
+Please provide:
+1. Missing indexes that should be added
+2. Missing constraints or relationships
+3. Data type optimizations
+4. Naming convention improvements
+5. Performance optimization suggestions
 
-CREATE TABLE departments (
-    department_id INT PRIMARY KEY AUTO_INCREMENT,
-    name VARCHAR(100) NOT NULL,
-    manager_id INT,
-    budget DECIMAL(12,2),
-    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-);
-""",
-        "Student Management": """
--- Student Management System Schema
-CREATE TABLE students (
-    student_id INT PRIMARY KEY AUTO_INCREMENT,
-    first_name VARCHAR(50) NOT NULL,
-    last_name VARCHAR(50) NOT NULL,
-    email VARCHAR(100) UNIQUE NOT NULL,
-    date_of_birth DATE,
-    enrollment_date DATE NOT NULL,
-    gpa DECIMAL(3,2),
-    is_active BOOLEAN DEFAULT TRUE
-);
+Keep suggestions concise and practical.
+""".strip()
 
-CREATE TABLE courses (
-    course_id INT PRIMARY KEY AUTO_INCREMENT,
-    course_code VARCHAR(10) UNIQUE NOT NULL,
-    course_name VARCHAR(200) NOT NULL,
-    credits INT NOT NULL,
-    instructor VARCHAR(100),
-    semester VARCHAR(20)
-);
-"""
+    # Example schemas for user reference, loaded from config/examples on first use
+    EXAMPLE_FILES = {
+        "E-commerce": "ecommerce.sql",
+        "HR Management": "hr.sql",
+        "Student Management": "students.sql"
     }
+    EXAMPLE_NAMES = tuple(EXAMPLE_FILES)
     
     @classmethod
+    @functools.lru_cache(maxsize=None)
     def get_model_info(cls, model_id: str) -> Dict[str, Any]:
         """Get information about a specific model."""
         return cls.AVAILABLE_MODELS.get(model_id, cls.AVAILABLE_MODELS["gemini-1.5-pro"])
     
     @classmethod
-    def get_model_names(cls) -> List[str]:
-        """Get list of available model names."""
-        return [info["name"] for info in cls.AVAILABLE_MODELS.values()]
+    def get_model_names(cls) -> Tuple[str, ...]:
+        """Get available model names."""
+        return cls.MODEL_NAMES
     
     @classmethod
     def get_model_id_by_name(cls, name: str) -> str:
         """Get model ID by display name."""
-        for model_id, info in cls.AVAILABLE_MODELS.items():
-            if info["name"] == name:
-                return model_id
-        return "gemini-1.5-pro"  # Default fallback
+        return cls._NAME_TO_ID.get(name, "gemini-1.5-pro")  # Default fallback
+    
+    @classmethod
+    def get_example_names(cls) -> Tuple[str, ...]:
+        """Get the names of the bundled example schemas."""
+        return cls.EXAMPLE_NAMES
+    
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def get_example(cls, name: str) -> str:
+        """Get the SQL of a bundled example schema by name."""
+        return (importlib.resources.files("config.examples") / cls.EXAMPLE_FILES[name]).read_text(encoding="utf-8")
+    
+    @classmethod
+    @functools.lru_cache(maxsize=32)
+    def render_system_instruction(cls, output_format: str) -> str:
+        """Render the static, dialect-specific part of the schema conversion prompt."""
+        return output_format.join(cls._SYSTEM_PARTS)
+    
+    @classmethod
+    def render_prompt_parts(cls, output_format: str, input_schema_or_sql: str) -> Tuple[str, str]:
+        """
+        Render the schema conversion prompt as a cacheable prefix and a per-request tail.
+        
+        Args:
+            output_format: Target SQL dialect
+            input_schema_or_sql: Schema, description or SQL to convert
+            
+        Returns:
+            Tuple of (system_instruction, user_content)
+        """
+        return cls.render_system_instruction(output_format), cls._INPUT_HEADER + input_schema_or_sql
     
     @classmethod
     def validate_config(cls, config: Dict[str, Any]) -> Dict[str, Any]:
@@ -1,122 +1,286 @@
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pacsv
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
+import hashlib
 import io
-from typing import Dict, Any, Union
+import threading
+from typing import Dict, Any, List, Optional, Tuple, Union
+
+def _skew_kurtosis(values: np.ndarray) -> Tuple[float, float]:
+    """
+    Compute sample skewness and excess kurtosis from one set of central moments.
+    
+    Matches the bias-corrected estimators used by pandas' Series.skew() and
+    Series.kurtosis(), but shares the deviations between both statistics.
+    
+    Args:
+        values: 1-D float array without missing values
+        
+    Returns:
+        Tuple of (skewness, kurtosis); NaN when there are too few values
+    """
+    n = len(values)
+    if n < 3:
+        return float('nan'), float('nan')
+    
+    deviations = values - values.mean()
+    squared = deviations * deviations
+    m2 = squared.sum()
+    m3 = (squared * deviations).sum()
+    m4 = (squared * squared).sum()
+    
+    # Constant columns have no shape; pandas reports zero for both
+    if m2 == 0:
+        return 0.0, (0.0 if n >= 4 else float('nan'))
+    
+    g1 = np.sqrt(n) * m3 / m2 ** 1.5
+    skewness = g1 * np.sqrt(n * (n - 1)) / (n - 2)
+    
+    if n < 4:
+        return float(skewness), float('nan')
+    
+    g2 = n * m4 / (m2 * m2) - 3
+    kurtosis = ((n + 1) * g2 + 6) * (n - 1) / ((n - 2) * (n - 3))
+    return float(skewness), float(kurtosis)
+
+# Boolean-like spellings, true values first so they map to the lowest categorical codes
+_TRUE_VALUES = ('true', '1', 'yes', 'y')
+_FALSE_VALUES = ('false', '0', 'no', 'n')
+_BOOLEAN_CATEGORIES = list(_TRUE_VALUES + _FALSE_VALUES)
+
+@dataclass
+class ColumnInfo:
+    """
+    Analysis results for a single column.
+    
+    Slotted to keep per-column overhead small for wide workbooks; fields that do not
+    apply to the column's type are None.
+    """
+    __slots__ = (
+        'name', 'dtype', 'missing_count', 'missing_percent', 'unique_count', 'unique_percent',
+        'unique_estimated', 'type', 'is_integer', 'stats', 'distribution', 'value_counts', 'examples', 'format_examples'
+    )
+    
+    name: Any
+    dtype: str
+    missing_count: int
+    missing_percent: float
+    unique_count: int
+    unique_percent: float
+    # True when unique_count/unique_percent were measured on a sample of the column
+    unique_estimated: bool
+    type: str
+    is_integer: Optional[bool]
+    stats: Optional[Dict[str, Any]]
+    distribution: Optional[Dict[str, Any]]
+    value_counts: Optional[Dict[Any, int]]
+    examples: Optional[List[Any]]
+    format_examples: Optional[List[str]]
+
+# Type-specific ColumnInfo fields, filled in by the per-type analyzers
+_TYPE_SPECIFIC_FIELDS = {
+    'is_integer': None,
+    'stats': None,
+    'distribution': None,
+    'value_counts': None,
+    'examples': None,
+    'format_examples': None
+}
 
 class DataAnalyzer:
     """Analyze existing data to understand patterns and distributions."""
     
-    def __init__(self):
+    def __init__(self, cache_size: int = 8):
         self.supported_extensions = ['.csv', '.xlsx', '.xls']
+        # Columns longer than this are profiled (uniques, frequencies, shape) on a sample
+        self.sample_cap = 50_000
+        # Analyses of recently seen uploads, keyed by content digest
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
     
-    def analyze_file(self, uploaded_file, noise_level: float = 0.05) -> Union[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+    def analyze_file(self, uploaded_file) -> Union[Dict[str, Any], Dict[str, Dict[str, Any]]]:
         """
         Analyze an uploaded file and return analysis results.
         
         Args:
             uploaded_file: Streamlit uploaded file object
-            noise_level: Amount of noise to add to synthetic data (0-1)
             
         Returns:
             Analysis dictionary or dict of sheet analyses for Excel files
         """
         file_extension = self._get_file_extension(uploaded_file.name)
+        if file_extension not in self.supported_extensions:
+            raise ValueError(f"Unsupported file type: {file_extension}")
+        
+        # Streamlit reruns re-submit the same upload; reuse the analysis of identical bytes
+        content = uploaded_file.getvalue()
+        cache_key = hashlib.blake2b(content, digest_size=16).hexdigest() + file_extension
+        with self._cache_lock:
+            if cache_key in self._cache:
+                self._cache.move_to_end(cache_key)
+                return self._cache[cache_key]
         
         if file_extension == '.csv':
-            return self._analyze_csv(uploaded_file, noise_level)
-        elif file_extension in ['.xlsx', '.xls']:
-            return self._analyze_excel(uploaded_file, noise_level)
+            analysis = self._analyze_csv(io.BytesIO(content))
         else:
-            raise ValueError(f"Unsupported file type: {file_extension}")
+            analysis = self._analyze_excel(io.BytesIO(content))
+        
+        with self._cache_lock:
+            self._cache[cache_key] = analysis
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        
+        return analysis
     
     def _get_file_extension(self, filename: str) -> str:
         """Extract file extension from filename."""
         return '.' + filename.split('.')[-1].lower()
     
-    def _analyze_csv(self, uploaded_file, noise_level: float) -> Dict[str, Any]:
+    def _analyze_csv(self, uploaded_file) -> Dict[str, Any]:
         """Analyze a CSV file."""
-        # Read CSV
+        # Read CSV with PyArrow's multithreaded reader. Bytes that are not valid
+        # UTF-8 come back as binary columns; re-read those files as latin-1.
         try:
-            df = pd.read_csv(uploaded_file, encoding='utf-8')
+            table = self._read_csv_table(uploaded_file, 'utf8')
+            if any(pa.types.is_binary(field.type) for field in table.schema):
+                uploaded_file.seek(0)
+                table = self._read_csv_table(uploaded_file, 'latin1')
+        except pa.ArrowInvalid:
+            # PyArrow rejects rows with fewer fields than the header, which pandas
+            # pads with NaN; fall back to the pandas reader for such files
+            uploaded_file.seek(0)
+            return self._analyze_dataframe(self._read_csv_pandas(uploaded_file))
+        
+        return self._analyze_dataframe(table.to_pandas())
+    
+    def _read_csv_table(self, uploaded_file, encoding: str) -> pa.Table:
+        """Read a CSV file into an Arrow table, treating empty strings as missing like pandas."""
+        return pacsv.read_csv(
+            uploaded_file,
+            read_options=pacsv.ReadOptions(encoding=encoding),
+            # Quoted values may span lines; without this the chunked reader can split
+            # a record across blocks on large files
+            parse_options=pacsv.ParseOptions(newlines_in_values=True),
+            convert_options=pacsv.ConvertOptions(strings_can_be_null=True)
+        )
+    
+    def _read_csv_pandas(self, uploaded_file) -> pd.DataFrame:
+        """Read a CSV file with pandas, retrying as latin-1 when it is not valid UTF-8."""
+        try:
+            return pd.read_csv(uploaded_file, encoding='utf-8')
         except UnicodeDecodeError:
-            df = pd.read_csv(uploaded_file, encoding='latin-1')
-        
-        return self._analyze_dataframe(df, noise_level)
+            uploaded_file.seek(0)
+            return pd.read_csv(uploaded_file, encoding='latin-1')
     
-    def _analyze_excel(self, uploaded_file, noise_level: float) -> Dict[str, Dict[str, Any]]:
+    def _analyze_excel(self, uploaded_file) -> Dict[str, Dict[str, Any]]:
         """Analyze an Excel file (potentially multiple sheets)."""
-        # Read all sheets
-        excel_file = pd.ExcelFile(uploaded_file)
-        sheet_analyses = {}
-        
-        for sheet_name in excel_file.sheet_names:
-            df = pd.read_excel(uploaded_file, sheet_name=sheet_name)
-            sheet_analyses[sheet_name] = self._analyze_dataframe(df, noise_level)
+        # Read all sheets in a single pass over the workbook
+        sheets = pd.read_excel(uploaded_file, sheet_name=None)
         
-        return sheet_analyses
+        # Analyze sheets concurrently; the pandas/NumPy reductions release the GIL
+        with ThreadPoolExecutor(max_workers=max(1, min(8, len(sheets)))) as executor:
+            analyses = executor.map(self._analyze_dataframe, sheets.values())
+            return dict(zip(sheets.keys(), analyses))
     
-    def _analyze_dataframe(self, df: pd.DataFrame, noise_level: float) -> Dict[str, Any]:
+    def _analyze_dataframe(self, df: pd.DataFrame) -> Dict[str, Any]:
         """
         Analyze a pandas DataFrame and extract patterns.
         
         Args:
             df: DataFrame to analyze
-            noise_level: Noise level for synthetic data generation
             
         Returns:
             Dictionary containing analysis results
         """
+        n_rows, n_cols = df.shape
         analysis = {
-            'rows': len(df),
-            'columns': len(df.columns),
-            'column_info': {},
-            'noise_level': noise_level
+            'rows': n_rows,
+            'columns': n_cols,
+            'column_info': {}
         }
         
+        # Classify columns with a known dtype in one pass; only the remaining
+        # (object/string) columns need the value-based probes in _analyze_column.
+        column_types = {}
+        for column in df.select_dtypes(include=np.number).columns:
+            column_types[column] = 'numeric'
+        for column in df.select_dtypes(include=['datetime', 'datetimetz']).columns:
+            column_types[column] = 'datetime'
+        for column in df.select_dtypes(include='bool').columns:
+            column_types[column] = 'boolean'
+        
         for column in df.columns:
-            col_analysis = self._analyze_column(df[column])
+            col_analysis = self._analyze_column(df[column], n_rows, column_types.get(column))
             analysis['column_info'][column] = col_analysis
         
         return analysis
     
-    def _analyze_column(self, series: pd.Series) -> Dict[str, Any]:
+    def _analyze_column(self, series: pd.Series, n_rows: int, column_type: Optional[str] = None) -> ColumnInfo:
         """
         Analyze a single column/series.
         
         Args:
             series: Pandas Series to analyze
+            n_rows: Length of the series
+            column_type: Type already known from the dtype ('numeric', 'datetime'
+                         or 'boolean'); probed from the values when None
             
         Returns:
-            Dictionary with column analysis
+            ColumnInfo with column analysis
         """
+        # Each reduction runs once; distinct values of large columns are counted on a sample
+        missing_count = int(series.isnull().sum())
+        sample = self._sample(series)
+        unique_count = int(sample.nunique())
         col_info = {
             'name': series.name,
             'dtype': str(series.dtype),
-            'missing_count': series.isnull().sum(),
-            'missing_percent': (series.isnull().sum() / len(series)) * 100,
-            'unique_count': series.nunique(),
-            'unique_percent': (series.nunique() / len(series)) * 100
+            'missing_count': missing_count,
+            'missing_percent': missing_count * 100.0 / n_rows if n_rows else 0.0,
+            'unique_count': unique_count,
+            # Relative to the sample the distinct values were counted on
+            'unique_percent': unique_count * 100.0 / len(sample) if len(sample) else 0.0,
+            'unique_estimated': len(sample) < n_rows,
+            **_TYPE_SPECIFIC_FIELDS
         }
         
         # Remove null values for analysis
         non_null_series = series.dropna()
         
         if len(non_null_series) == 0:
-            col_info['type'] = 'empty'
-            return col_info
-        
-        # Determine column type and analyze accordingly
-        if self._is_numeric_column(non_null_series):
+            return ColumnInfo(type='empty', **col_info)
+        
+        # Determine column type (unless known from the dtype) and analyze accordingly
+        if column_type is None:
+            if self._is_numeric_column(non_null_series):
+                column_type = 'numeric'
+            elif self._is_datetime_column(non_null_series):
+                column_type = 'datetime'
+            elif self._is_boolean_column(non_null_series):
+                column_type = 'boolean'
+        
+        if column_type == 'numeric':
             col_info.update(self._analyze_numeric_column(non_null_series))
-        elif self._is_datetime_column(non_null_series):
+        elif column_type == 'datetime':
             col_info.update(self._analyze_datetime_column(non_null_series))
-        elif self._is_boolean_column(non_null_series):
+        elif column_type == 'boolean':
             col_info.update(self._analyze_boolean_column(non_null_series))
         else:
             col_info.update(self._analyze_categorical_column(non_null_series))
         
-        return col_info
+        return ColumnInfo(**col_info)
+    
+    def _sample(self, series: pd.Series) -> pd.Series:
+        """Return a reproducible sample of at most sample_cap values from series."""
+        if len(series) > self.sample_cap:
+            return series.sample(self.sample_cap, random_state=0)
+        return series
     
     def _is_numeric_column(self, series: pd.Series) -> bool:
         """Check if column contains numeric data."""
@@ -124,24 +288,25 @@ class DataAnalyzer:
     
     def _can_convert_to_numeric(self, series: pd.Series) -> bool:
         """Check if string column can be converted to numeric."""
-        try:
-            pd.to_numeric(series.head(min(100, len(series))))
-            return True
-        except (ValueError, TypeError):
+        # Only text columns can hold numbers as strings; coercing avoids raising per probe
+        if not pd.api.types.is_string_dtype(series.dtype):
+            return False
+        
+        # Object columns of True/False (e.g. a CSV bool column with blanks) are boolean
+        head = series.iloc[:100]
+        if pd.api.types.infer_dtype(head, skipna=True) == 'boolean':
             return False
+        
+        return bool(pd.to_numeric(head, errors='coerce').notna().all())
     
     def _is_datetime_column(self, series: pd.Series) -> bool:
         """Check if column contains datetime data."""
         if pd.api.types.is_datetime64_any_dtype(series):
             return True
         
-        # Try to parse as datetime
-        if series.dtype == 'object':
-            try:
-                pd.to_datetime(series.head(min(10, len(series))))
-                return True
-            except (ValueError, TypeError):
-                return False
+        # Try to parse as datetime (object or string dtype)
+        if pd.api.types.is_string_dtype(series.dtype):
+            return bool(pd.to_datetime(series.iloc[:10], errors='coerce').notna().all())
         
         return False
     
@@ -150,11 +315,15 @@ class DataAnalyzer:
         if pd.api.types.is_bool_dtype(series):
             return True
         
+        # Bail out before any string conversion when there are more distinct raw
+        # values than boolean spellings (allowing for casing variants like Yes/yes)
+        if series.nunique(dropna=True) > len(_BOOLEAN_CATEGORIES):
+            return False
+        
         # Check if all values are boolean-like
-        unique_values = set(series.astype(str).str.lower().unique())
-        boolean_values = {'true', 'false', '1', '0', 'yes', 'no', 'y', 'n'}
+        unique_values = set(series.dropna().astype(str).str.lower().unique())
         
-        return len(unique_values) <= 2 and unique_values.issubset(boolean_values)
+        return len(unique_values) <= 2 and unique_values.issubset(_BOOLEAN_CATEGORIES)
     
     def _analyze_numeric_column(self, series: pd.Series) -> Dict[str, Any]:
         """Analyze numeric column."""
@@ -164,24 +333,32 @@ class DataAnalyzer:
         else:
             numeric_series = series
         
-        # Check if it's integer-like
-        is_integer = all(x.is_integer() for x in numeric_series if pd.notna(x) and isinstance(x, (int, float)))
+        # Check if it's integer-like (vectorized; integer dtypes short-circuit)
+        if pd.api.types.is_integer_dtype(numeric_series):
+            is_integer = True
+        else:
+            values = numeric_series.to_numpy(dtype=np.float64)
+            values = values[~np.isnan(values)]
+            is_integer = bool(np.all(np.mod(values, 1) == 0))
         
+        # One describe() call instead of seven separate reductions; on float64 so
+        # bool-valued input still yields the numeric summary rather than top/freq
+        summary = numeric_series.astype('float64').describe(percentiles=[0.25, 0.5, 0.75])
         stats = {
-            'min': float(numeric_series.min()),
-            'max': float(numeric_series.max()),
-            'mean': float(numeric_series.mean()),
-            'median': float(numeric_series.median()),
-            'std': float(numeric_series.std()),
-            'q25': float(numeric_series.quantile(0.25)),
-            'q75': float(numeric_series.quantile(0.75))
+            'min': float(summary['min']),
+            'max': float(summary['max']),
+            'mean': float(summary['mean']),
+            'median': float(summary['50%']),
+            'std': float(summary['std']),
+            'q25': float(summary['25%']),
+            'q75': float(summary['75%'])
         }
         
         return {
             'type': 'numeric',
             'is_integer': is_integer,
             'stats': stats,
-            'distribution': self._get_distribution_info(numeric_series)
+            'distribution': self._get_distribution_info(self._sample(numeric_series))
         }
     
     def _analyze_datetime_column(self, series: pd.Series) -> Dict[str, Any]:
@@ -201,23 +378,18 @@ class DataAnalyzer:
         return {
             'type': 'datetime',
             'stats': stats,
-            'format_examples': datetime_series.head(3).astype(str).tolist()
+            'format_examples': datetime_series.iloc[:3].astype(str).tolist()
         }
     
     def _analyze_boolean_column(self, series: pd.Series) -> Dict[str, Any]:
         """Analyze boolean column."""
-        # Convert to boolean
-        bool_mapping = {
-            'true': True, 'false': False,
-            '1': True, '0': False,
-            'yes': True, 'no': False,
-            'y': True, 'n': False
-        }
-        
-        bool_series = series.astype(str).str.lower().map(bool_mapping)
+        # Map values onto the fixed boolean categories; the leading codes are the true ones
+        codes = pd.Categorical(
+            series.astype('string').str.lower(), categories=_BOOLEAN_CATEGORIES
+        ).codes
         
-        true_count = bool_series.sum()
-        total_count = len(bool_series)
+        true_count = ((codes >= 0) & (codes < len(_TRUE_VALUES))).sum()
+        total_count = len(series)
         
         stats = {
             'true_count': int(true_count),
@@ -232,10 +404,11 @@ class DataAnalyzer:
     
     def _analyze_categorical_column(self, series: pd.Series) -> Dict[str, Any]:
         """Analyze categorical column."""
-        value_counts = series.value_counts()
+        # Frequencies of large columns are estimated from a sample
+        value_counts = self._sample(series).value_counts()
         
         # Get top categories (limit to prevent memory issues)
-        top_categories = value_counts.head(50).to_dict()
+        top_categories = value_counts.iloc[:50].to_dict()
         
         stats = {
             'most_common': value_counts.index[0] if len(value_counts) > 0 else None,
@@ -247,15 +420,14 @@ class DataAnalyzer:
             'type': 'categorical',
             'value_counts': top_categories,
             'stats': stats,
-            'examples': series.head(5).tolist()
+            'examples': series.iloc[:5].tolist()
         }
     
     def _get_distribution_info(self, series: pd.Series) -> Dict[str, Any]:
         """Get distribution information for numeric data."""
         try:
             # Basic distribution analysis
-            skewness = float(series.skew())
-            kurtosis = float(series.kurtosis())
+            skewness, kurtosis = _skew_kurtosis(series.to_numpy(dtype=np.float64))
             
             # Detect potential distribution type
             distribution_type = 'normal'  # Default
@@ -279,21 +451,18 @@ class DataAnalyzer:
         
         summary_parts.append(f"Dataset contains {analysis['rows']} rows and {analysis['columns']} columns.")
         
-        type_counts = {}
-        for col_info in analysis['column_info'].values():
-            col_type = col_info['type']
-            type_counts[col_type] = type_counts.get(col_type, 0) + 1
+        type_counts = Counter(col_info.type for col_info in analysis['column_info'].values())
         
-        type_summary = ', '.join([f"{count} {type_name}" for type_name, count in type_counts.items()])
+        type_summary = ', '.join(f"{count} {type_name}" for type_name, count in type_counts.items())
         summary_parts.append(f"Column types: {type_summary}.")
         
         # Identify potential issues
-        high_missing_cols = [
-            col_name for col_name, col_info in analysis['column_info'].items()
-            if col_info['missing_percent'] > 20
-        ]
+        high_missing_cols = ', '.join(
+            str(col_name) for col_name, col_info in analysis['column_info'].items()
+            if col_info.missing_percent > 20
+        )
         
         if high_missing_cols:
-            summary_parts.append(f"Columns with high missing values (>20%): {', '.join(high_missing_cols)}")
+            summary_parts.append(f"Columns with high missing values (>20%): {high_missing_cols}")
         
         return ' '.join(summary_parts)
\ No newline at end of file
@@ -1,19 +1,90 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-import random
+import functools
 import string
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple, Union
 from faker import Faker
+from faker.exceptions import UniquenessException
+from data_analyzer import ColumnInfo
+
+def _build_alias_table(probabilities: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Build Vose's alias table for sampling from a discrete distribution.
+    
+    Args:
+        probabilities: Normalized category probabilities
+        
+    Returns:
+        Tuple of (acceptance probability, alias index) arrays, one entry per category
+    """
+    k = len(probabilities)
+    scaled = probabilities * k
+    accept = np.ones(k, dtype=np.float64)
+    alias = np.arange(k, dtype=np.intp)
+    
+    small = [i for i in range(k) if scaled[i] < 1.0]
+    large = [i for i in range(k) if scaled[i] >= 1.0]
+    while small and large:
+        short, tall = small.pop(), large.pop()
+        accept[short] = scaled[short]
+        alias[short] = tall
+        scaled[tall] = (scaled[tall] + scaled[short]) - 1.0
+        (small if scaled[tall] < 1.0 else large).append(tall)
+    
+    # Anything left over is within rounding error of 1 and always accepts itself
+    return accept, alias
+
+def _smallest_int_dtype(min_val: int, max_val: int) -> type:
+    """Return the narrowest signed integer dtype holding every value in [min_val, max_val]."""
+    for dtype in (np.int8, np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if info.min <= min_val and max_val <= info.max:
+            return dtype
+    return np.int64
+
+# Distinct Faker values drawn per non-unique string column; rows are sampled from this pool
+_FAKER_POOL_SIZE = 1024
+
+# Characters used for random (non-Faker) string values
+_ALPHABET = np.frombuffer((string.ascii_letters + string.digits + ' ').encode('ascii'), dtype=np.uint8)
 
 class DataGenerator:
     """Generate synthetic data based on schema or existing data analysis."""
     
-    def __init__(self):
+    # Column-name keyword -> Faker method, checked in order (earlier keywords take precedence)
+    _KEYWORD_MAP = {
+        'name': 'name', 'first_name': 'name', 'lastname': 'name',
+        'email': 'email', 'mail': 'email',
+        'phone': 'phone_number', 'mobile': 'phone_number', 'tel': 'phone_number',
+        'address': 'address', 'street': 'address',
+        'city': 'city',
+        'state': 'state', 'province': 'state',
+        'country': 'country',
+        'company': 'company', 'organization': 'company',
+        'job': 'job', 'position': 'job', 'title': 'job',
+        'description': 'text', 'text': 'text', 'comment': 'text'
+    }
+    
+    def __init__(self, seed: Union[int, np.random.SeedSequence] = 42):
+        """
+        Args:
+            seed: Seed for reproducible results, or a SeedSequence child when running
+                  as one of several independent workers
+        """
+        self._seed_sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        
         self.fake = Faker()
-        self.fake.seed_instance(42)  # For reproducible results
-        np.random.seed(42)
-        random.seed(42)
+        # Call every provider _KEYWORD_MAP can select once, so lazy provider setup
+        # happens here rather than inside the first generation loop
+        for method in dict.fromkeys(self._KEYWORD_MAP.values()):
+            getattr(self.fake, method)()
+        # For reproducible results (after the warm-up calls)
+        self.fake.seed_instance(seed if isinstance(seed, int) else int(seed.generate_state(1)[0]))
+        # Single NumPy source of randomness for all vectorized draws. A Generator is not
+        # thread-safe, so concurrent workers must each own a DataGenerator.
+        self.rng = np.random.default_rng(self._seed_sequence)
+        self._faker_method_cache = {}  # Column name -> Faker method name (or None)
     
     def generate_from_schema(self, columns: List[Dict[str, Any]], num_samples: int) -> pd.DataFrame:
         """
@@ -26,65 +97,69 @@ class DataGenerator:
         Returns:
             DataFrame with synthetic data
         """
+        data = self._generate_columns(columns, num_samples)
+        
+        # Every column is already an array of num_samples values; build the frame without copies
+        return pd.DataFrame(data, index=pd.RangeIndex(num_samples), copy=False)
+    
+    def _generate_columns(self, columns: List[Dict[str, Any]], num_samples: int) -> Dict[str, np.ndarray]:
+        """Generate each schema column in turn."""
         data = {}
         unique_counters = {}  # Track counters for unique/auto-increment fields
         
+        # Generators by column type, all called as fn(num_samples, params, col_name)
+        dispatch = {
+            'integer': functools.partial(self._generate_integers, unique_counters=unique_counters),
+            'float': self._generate_floats,
+            'string': self._generate_strings,
+            'date': self._generate_dates,
+            'datetime': self._generate_datetimes,
+            'boolean': self._generate_booleans
+        }
+        
         for column in columns:
             col_name = column['name']
-            col_type = column['type']
             params = column.get('params', {})
             
-            # Generate data based on column type
-            if col_type == 'integer':
-                data[col_name] = self._generate_integers(num_samples, params, unique_counters, col_name)
-            elif col_type == 'float':
-                data[col_name] = self._generate_floats(num_samples, params)
-            elif col_type == 'string':
-                data[col_name] = self._generate_strings(num_samples, params, col_name)
-            elif col_type == 'date':
-                data[col_name] = self._generate_dates(num_samples, params)
-            elif col_type == 'datetime':
-                data[col_name] = self._generate_datetimes(num_samples, params)
-            elif col_type == 'boolean':
-                data[col_name] = self._generate_booleans(num_samples, params)
-            else:
-                # Default to string for unknown types
-                data[col_name] = self._generate_strings(num_samples, params, col_name)
+            # Generate data based on column type (default to string for unknown types)
+            generate = dispatch.get(column['type'], self._generate_strings)
+            data[col_name] = generate(num_samples, params, col_name)
         
-        return pd.DataFrame(data)
+        return data
     
-    def generate_from_analysis(self, analysis: Dict[str, Any], num_samples: int) -> pd.DataFrame:
+    def generate_from_analysis(self, analysis: Dict[str, Any], num_samples: int,
+                               noise_level: float = 0.05) -> pd.DataFrame:
         """
         Generate synthetic data based on existing data analysis.
         
         Args:
             analysis: Analysis results from DataAnalyzer
             num_samples: Number of rows to generate
+            noise_level: Amount of noise to add to numeric columns (0-1)
             
         Returns:
             DataFrame with synthetic data
         """
         data = {}
         
+        # Generators by analyzed column type, all called as fn(num_samples, col_info)
+        dispatch = {
+            'numeric': functools.partial(self._generate_from_numeric_analysis, noise_level=noise_level),
+            'categorical': self._generate_from_categorical_analysis,
+            'datetime': self._generate_from_datetime_analysis,
+            'boolean': self._generate_from_boolean_analysis
+        }
+        
         for col_name, col_info in analysis['column_info'].items():
-            col_type = col_info['type']
-            
-            if col_type == 'numeric':
-                data[col_name] = self._generate_from_numeric_analysis(num_samples, col_info)
-            elif col_type == 'categorical':
-                data[col_name] = self._generate_from_categorical_analysis(num_samples, col_info)
-            elif col_type == 'datetime':
-                data[col_name] = self._generate_from_datetime_analysis(num_samples, col_info)
-            elif col_type == 'boolean':
-                data[col_name] = self._generate_from_boolean_analysis(num_samples, col_info)
-            else:
-                # Default to categorical
-                data[col_name] = self._generate_from_categorical_analysis(num_samples, col_info)
+            # Default to categorical
+            generate = dispatch.get(col_info.type, self._generate_from_categorical_analysis)
+            data[col_name] = generate(num_samples, col_info)
         
-        return pd.DataFrame(data)
+        # Every column is already an array of num_samples values; build the frame without copies
+        return pd.DataFrame(data, index=pd.RangeIndex(num_samples), copy=False)
     
-    def _generate_integers(self, num_samples: int, params: Dict[str, Any], 
-                          unique_counters: Dict[str, int], col_name: str) -> List[int]:
+    def _generate_integers(self, num_samples: int, params: Dict[str, Any], col_name: str,
+                          unique_counters: Dict[str, int]) -> np.ndarray:
         """Generate integer values."""
         min_val = params.get('min_value', 1)
         max_val = params.get('max_value', 100000)
@@ -95,28 +170,28 @@ class DataGenerator:
         if auto_increment:
             # Generate sequential IDs
             start_val = unique_counters.get(col_name, 1)
-            values = list(range(start_val, start_val + num_samples))
+            dtype = _smallest_int_dtype(start_val, start_val + num_samples - 1)
+            values = np.arange(start_val, start_val + num_samples, dtype=dtype)
             unique_counters[col_name] = start_val + num_samples
         elif unique:
             # Generate unique random integers
             if max_val - min_val + 1 < num_samples:
                 # Expand range if needed
                 max_val = min_val + num_samples
-            values = random.sample(range(min_val, max_val + 1), num_samples)
+            values = self.rng.choice(max_val - min_val + 1, size=num_samples, replace=False) + min_val
+            values = values.astype(_smallest_int_dtype(min_val, max_val), copy=False)
         else:
             # Generate random integers
-            values = [random.randint(min_val, max_val) for _ in range(num_samples)]
+            dtype = _smallest_int_dtype(min_val, max_val)
+            values = self.rng.integers(min_val, max_val + 1, size=num_samples, dtype=dtype)
         
         # Add null values if nullable
         if nullable:
-            null_count = int(num_samples * 0.05)  # 5% null values
-            null_indices = random.sample(range(num_samples), null_count)
-            for idx in null_indices:
-                values[idx] = None
+            values = self._apply_null_mask(values)
         
         return values
     
-    def _generate_floats(self, num_samples: int, params: Dict[str, Any]) -> List[float]:
+    def _generate_floats(self, num_samples: int, params: Dict[str, Any], col_name: str) -> np.ndarray:
         """Generate float values."""
         min_val = params.get('min_value', 0.0)
         max_val = params.get('max_value', 10000.0)
@@ -124,24 +199,19 @@ class DataGenerator:
         scale = params.get('scale', 2)
         nullable = params.get('nullable', False)
         
-        values = []
-        for _ in range(num_samples):
-            value = random.uniform(min_val, max_val)
-            if precision:
-                # Round to specified decimal places
-                value = round(value, scale)
-            values.append(value)
+        values = self.rng.uniform(min_val, max_val, size=num_samples)
+        if precision:
+            # Round to specified decimal places
+            # Kept as float64: float32 values print widened (511.82 -> 511.82000732) in Excel
+            np.round(values, scale, out=values)
         
         # Add null values if nullable
         if nullable:
-            null_count = int(num_samples * 0.05)
-            null_indices = random.sample(range(num_samples), null_count)
-            for idx in null_indices:
-                values[idx] = None
+            values = self._apply_null_mask(values)
         
         return values
     
-    def _generate_strings(self, num_samples: int, params: Dict[str, Any], col_name: str) -> List[str]:
+    def _generate_strings(self, num_samples: int, params: Dict[str, Any], col_name: str) -> np.ndarray:
         """Generate string values."""
         min_length = params.get('min_length', 1)
         max_length = params.get('max_length', 255)
@@ -151,177 +221,228 @@ class DataGenerator:
         # Choose appropriate faker method based on column name
         faker_method = self._choose_faker_method(col_name)
         
-        values = []
-        used_values = set()
+        if not unique:
+            if faker_method:
+                # Sample rows from a pool of provider values instead of calling Faker per row
+                fake_value = getattr(self.fake, faker_method)
+                pool = np.empty(min(num_samples, _FAKER_POOL_SIZE), dtype=object)
+                pool[:] = [fake_value()[:max_length] for _ in range(pool.size)]
+                values = pool[self.rng.integers(0, max(pool.size, 1), size=num_samples)]
+            else:
+                values = np.empty(num_samples, dtype=object)
+                values[:] = self._random_strings(num_samples, min_length, min(max_length, 50))
+        else:
+            values = self._generate_unique_strings(num_samples, min_length, max_length, faker_method)
+        
+        # Add null values if nullable
+        if nullable:
+            values = self._apply_null_mask(values)
+        
+        return values
+    
+    def _generate_unique_strings(self, num_samples: int, min_length: int, max_length: int,
+                                 faker_method: Optional[str]) -> np.ndarray:
+        """Generate distinct string values, from Faker when a provider matches the column."""
+        if faker_method:
+            # Faker's unique proxy avoids duplicates up front
+            self.fake.unique.clear()
+            fake_value = getattr(self.fake.unique, faker_method)
+        else:
+            random_strings = self._random_strings(num_samples, min_length, min(max_length, 50))
         
-        for _ in range(num_samples):
+        values = np.empty(num_samples, dtype=object)
+        seen = set()
+        next_suffix = 0
+        
+        for i in range(num_samples):
             if faker_method:
                 # Use Faker for realistic data
-                value = str(getattr(self.fake, faker_method)())
+                try:
+                    value = fake_value()
+                except UniquenessException:
+                    # Provider ran out of distinct values; repeats are suffixed below
+                    fake_value = getattr(self.fake, faker_method)
+                    value = fake_value()
             else:
-                # Generate random string
-                length = random.randint(min_length, min(max_length, 50))
-                value = ''.join(random.choices(string.ascii_letters + string.digits + ' ', k=length))
-            
-            # Ensure uniqueness if required
-            if unique:
-                counter = 1
-                original_value = value
-                while value in used_values:
-                    value = f"{original_value}_{counter}"
-                    counter += 1
-                used_values.add(value)
+                value = random_strings[i]
             
-            # Truncate if too long
-            if len(value) > max_length:
-                value = value[:max_length]
+            # Uniqueness is checked after truncation, since truncation itself can collide
+            base = value[:max_length]
+            value = base
+            while value in seen:
+                # Append a base-36 counter, shortening the base so the result still fits
+                suffix = np.base_repr(next_suffix, 36).lower()
+                next_suffix += 1
+                if len(suffix) > max_length:
+                    raise ValueError(
+                        f"Cannot generate {num_samples} unique values of at most {max_length} characters"
+                    )
+                if len(suffix) < max_length:
+                    suffix = f"_{suffix}"
+                value = base[:max_length - len(suffix)] + suffix
             
-            values.append(value)
+            seen.add(value)
+            values[i] = value
         
-        # Add null values if nullable
-        if nullable:
-            null_count = int(num_samples * 0.05)
-            null_indices = random.sample(range(num_samples), null_count)
-            for idx in null_indices:
-                values[idx] = None
+        return values
+    
+    def _random_strings(self, num_samples: int, min_length: int, max_length: int) -> List[str]:
+        """Generate random alphanumeric strings by slicing one vectorized character pool."""
+        lengths = self.rng.integers(min_length, max_length + 1, size=num_samples)
+        ends = np.cumsum(lengths)
+        
+        pool = _ALPHABET[self.rng.integers(0, _ALPHABET.size, size=int(ends[-1]) if num_samples else 0)]
+        text = pool.tobytes().decode('ascii')
+        
+        return [text[end - length:end] for end, length in zip(ends.tolist(), lengths.tolist())]
+    
+    def _apply_null_mask(self, values: np.ndarray,
+                         null_probability: float = 0.05) -> Union[np.ndarray, pd.api.extensions.ExtensionArray]:
+        """
+        Blank out a random share of values with the missing marker for their dtype.
+        
+        Args:
+            values: Generated column values
+            null_probability: Chance of each value being set to null
+            
+        Returns:
+            Array with nulls applied: masked Int/boolean arrays for integer and boolean
+            values, NaN/NaT in place for float and datetime values, None otherwise
+        """
+        mask = self.rng.random(values.size) < null_probability
+        
+        # Integers and booleans keep their compact NumPy buffer plus a validity mask
+        if values.dtype.kind in 'iu':
+            return pd.arrays.IntegerArray(values, mask)
+        if values.dtype.kind == 'b':
+            return pd.arrays.BooleanArray(values, mask)
+        
+        if values.dtype.kind == 'f':
+            values[mask] = np.nan
+        elif values.dtype.kind == 'M':
+            values[mask] = np.datetime64('NaT')
+        else:
+            values = values.astype(object, copy=False)
+            values[mask] = None
         
         return values
     
-    def _choose_faker_method(self, col_name: str) -> str:
+    def _choose_faker_method(self, col_name: str) -> Optional[str]:
         """Choose appropriate Faker method based on column name."""
+        # Column names repeat across tables and runs; scan the keywords once per name
+        if col_name in self._faker_method_cache:
+            return self._faker_method_cache[col_name]
+        
         col_lower = col_name.lower()
         
-        if any(keyword in col_lower for keyword in ['name', 'first_name', 'lastname']):
-            return 'name'
-        elif any(keyword in col_lower for keyword in ['email', 'mail']):
-            return 'email'
-        elif any(keyword in col_lower for keyword in ['phone', 'mobile', 'tel']):
-            return 'phone_number'
-        elif any(keyword in col_lower for keyword in ['address', 'street']):
-            return 'address'
-        elif any(keyword in col_lower for keyword in ['city']):
-            return 'city'
-        elif any(keyword in col_lower for keyword in ['state', 'province']):
-            return 'state'
-        elif any(keyword in col_lower for keyword in ['country']):
-            return 'country'
-        elif any(keyword in col_lower for keyword in ['company', 'organization']):
-            return 'company'
-        elif any(keyword in col_lower for keyword in ['job', 'position', 'title']):
-            return 'job'
-        elif any(keyword in col_lower for keyword in ['description', 'text', 'comment']):
-            return 'text'
-        else:
-            return None
+        # First keyword found wins, in _KEYWORD_MAP order
+        method = next(
+            (method for keyword, method in self._KEYWORD_MAP.items() if keyword in col_lower), None
+        )
+        self._faker_method_cache[col_name] = method
+        return method
     
-    def _generate_dates(self, num_samples: int, params: Dict[str, Any]) -> List:
+    def _generate_dates(self, num_samples: int, params: Dict[str, Any], col_name: str) -> np.ndarray:
         """Generate date values."""
-        start_date = datetime.strptime(params.get('start_date', '2020-01-01'), '%Y-%m-%d').date()
-        end_date = datetime.strptime(params.get('end_date', '2024-12-31'), '%Y-%m-%d').date()
+        start_date = np.datetime64(params.get('start_date', '2020-01-01'), 'D')
+        end_date = np.datetime64(params.get('end_date', '2024-12-31'), 'D')
         nullable = params.get('nullable', False)
         
-        values = []
-        for _ in range(num_samples):
-            random_date = self.fake.date_between(start_date=start_date, end_date=end_date)
-            values.append(random_date)
+        # Random day offsets into the (inclusive) range, converted to datetime.date objects
+        span_days = int((end_date - start_date).astype(np.int64)) + 1
+        offsets = self.rng.integers(0, span_days, size=num_samples, dtype=np.int64)
+        values = (start_date + offsets.astype('timedelta64[D]')).astype(object)
         
         # Add null values if nullable
         if nullable:
-            null_count = int(num_samples * 0.05)
-            null_indices = random.sample(range(num_samples), null_count)
-            for idx in null_indices:
-                values[idx] = None
+            values = self._apply_null_mask(values)
         
         return values
     
-    def _generate_datetimes(self, num_samples: int, params: Dict[str, Any]) -> List:
+    def _generate_datetimes(self, num_samples: int, params: Dict[str, Any], col_name: str) -> np.ndarray:
         """Generate datetime values."""
-        start_date = datetime.strptime(params.get('start_date', '2020-01-01'), '%Y-%m-%d')
-        end_date = datetime.strptime(params.get('end_date', '2024-12-31'), '%Y-%m-%d')
+        start_date = np.datetime64(params.get('start_date', '2020-01-01'), 's')
+        end_date = np.datetime64(params.get('end_date', '2024-12-31'), 's')
         nullable = params.get('nullable', False)
         
-        values = []
-        for _ in range(num_samples):
-            random_datetime = self.fake.date_time_between(start_date=start_date, end_date=end_date)
-            values.append(random_datetime)
+        # Random second offsets into the range
+        span_seconds = int((end_date - start_date).astype(np.int64)) + 1
+        offsets = self.rng.integers(0, span_seconds, size=num_samples, dtype=np.int64)
+        values = start_date + offsets.astype('timedelta64[s]')
         
         # Add null values if nullable
         if nullable:
-            null_count = int(num_samples * 0.05)
-            null_indices = random.sample(range(num_samples), null_count)
-            for idx in null_indices:
-                values[idx] = None
+            values = self._apply_null_mask(values)
         
         return values
     
-    def _generate_booleans(self, num_samples: int, params: Dict[str, Any]) -> List:
+    def _generate_booleans(self, num_samples: int, params: Dict[str, Any], col_name: str) -> np.ndarray:
         """Generate boolean values."""
         true_prob = params.get('true_probability', 0.5)
         nullable = params.get('nullable', False)
         
-        values = []
-        for _ in range(num_samples):
-            value = random.random() < true_prob
-            values.append(value)
+        values = self.rng.random(num_samples) < true_prob
         
         # Add null values if nullable
         if nullable:
-            null_count = int(num_samples * 0.05)
-            null_indices = random.sample(range(num_samples), null_count)
-            for idx in null_indices:
-                values[idx] = None
+            values = self._apply_null_mask(values)
         
         return values
     
-    def _generate_from_numeric_analysis(self, num_samples: int, col_info: Dict[str, Any]) -> List:
+    def _generate_from_numeric_analysis(self, num_samples: int, col_info: ColumnInfo,
+                                        noise_level: float = 0.05) -> np.ndarray:
         """Generate numeric data based on analysis of existing data."""
-        stats = col_info.get('stats', {})
+        stats = col_info.stats or {}
         min_val = stats.get('min', 0)
         max_val = stats.get('max', 100)
         mean = stats.get('mean', (min_val + max_val) / 2)
         std = stats.get('std', (max_val - min_val) / 4)
         
         # Generate using normal distribution with clipping
-        values = np.random.normal(mean, std, num_samples)
-        values = np.clip(values, min_val, max_val)
+        values = self.rng.normal(mean, std, num_samples)
+        np.clip(values, min_val, max_val, out=values)
         
-        # Add noise based on noise level
-        noise_level = col_info.get('noise_level', 0.05)
+        # Add noise based on noise level, in place so no extra full-size arrays are made
         if noise_level > 0:
-            noise = np.random.normal(0, std * noise_level, num_samples)
-            values += noise
-            values = np.clip(values, min_val, max_val)
+            values += self.rng.normal(0, std * noise_level, num_samples)
+            np.clip(values, min_val, max_val, out=values)
         
-        # Convert to integers if original data was integer
-        if col_info.get('is_integer', False):
-            values = values.astype(int)
+        # Convert to integers if original data was integer (round to nearest, in place,
+        # rather than truncating toward zero)
+        if col_info.is_integer:
+            np.rint(values, out=values)
+            values = values.astype(_smallest_int_dtype(int(np.floor(min_val)), int(np.ceil(max_val))))
         
-        return values.tolist()
+        return values
     
-    def _generate_from_categorical_analysis(self, num_samples: int, col_info: Dict[str, Any]) -> List:
+    def _generate_from_categorical_analysis(self, num_samples: int,
+                                            col_info: ColumnInfo) -> Union[pd.Categorical, np.ndarray]:
         """Generate categorical data based on analysis of existing data."""
-        value_counts = col_info.get('value_counts', {})
+        value_counts = col_info.value_counts or {}
         
         if not value_counts:
             # Fallback to random strings
-            return [f"Category_{i}" for i in range(num_samples)]
+            return np.array([f"Category_{i}" for i in range(num_samples)], dtype=object)
         
         # Create weighted choices based on original distribution
-        values = list(value_counts.keys())
-        weights = list(value_counts.values())
+        values = np.empty(len(value_counts), dtype=object)
+        values[:] = list(value_counts.keys())
+        weights = np.fromiter(value_counts.values(), dtype=np.float64, count=len(value_counts))
         
         # Normalize weights
-        total_weight = sum(weights)
-        probabilities = [w / total_weight for w in weights]
+        weights /= weights.sum()
         
-        # Generate samples
-        generated = np.random.choice(values, size=num_samples, p=probabilities)
+        # Generate samples with the alias method: O(1) per draw instead of a CDF search
+        accept, alias = _build_alias_table(weights)
+        picks = self.rng.integers(0, len(values), size=num_samples)
+        picks = np.where(self.rng.random(num_samples) < accept[picks], picks, alias[picks])
         
-        return generated.tolist()
+        # The picks are category codes; a Categorical stores them instead of one object per row
+        return pd.Categorical.from_codes(picks, categories=pd.Index(values, dtype=object))
     
-    def _generate_from_datetime_analysis(self, num_samples: int, col_info: Dict[str, Any]) -> List:
+    def _generate_from_datetime_analysis(self, num_samples: int, col_info: ColumnInfo) -> pd.DatetimeIndex:
         """Generate datetime data based on analysis of existing data."""
-        stats = col_info.get('stats', {})
+        stats = col_info.stats or {}
         min_date = stats.get('min')
         max_date = stats.get('max')
         
@@ -330,22 +451,16 @@ class DataGenerator:
             min_date = datetime(2020, 1, 1)
             max_date = datetime(2024, 12, 31)
         
-        # Generate random datetimes in the range
-        values = []
-        for _ in range(num_samples):
-            random_datetime = self.fake.date_time_between(start_date=min_date, end_date=max_date)
-            values.append(random_datetime)
+        # Random second offsets into the observed range (keeps any timezone of the source)
+        min_date = pd.Timestamp(min_date)
+        span_seconds = int((pd.Timestamp(max_date) - min_date).total_seconds()) + 1
+        offsets = self.rng.integers(0, span_seconds, size=num_samples, dtype=np.int64)
         
-        return values
+        return min_date + pd.to_timedelta(offsets, unit='s')
     
-    def _generate_from_boolean_analysis(self, num_samples: int, col_info: Dict[str, Any]) -> List:
+    def _generate_from_boolean_analysis(self, num_samples: int, col_info: ColumnInfo) -> np.ndarray:
         """Generate boolean data based on analysis of existing data."""
-        stats = col_info.get('stats', {})
+        stats = col_info.stats or {}
         true_ratio = stats.get('true_ratio', 0.5)
         
-        values = []
-        for _ in range(num_samples):
-            value = random.random() < true_ratio
-            values.append(value)
-        
-        return values
\ No newline at end of file
+        return self.rng.random(num_samples) < true_ratio
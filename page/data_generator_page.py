@@ -1,14 +1,63 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+import functools
+import hashlib
 import io
+import json
+import os
+import tempfile
+import time
 import zipfile
-import random
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Optional, Tuple, Union
 from schema_parser import SchemaParser
 from data_generator import DataGenerator
 from data_analyzer import DataAnalyzer
 from utils import create_sample_schema
 from config.llm_config import LLMConfig
 
+# Static page fragments, rendered with st.html to skip the Markdown pipeline
+_CONVERTED_SCHEMA_INFO_HTML = """
+<div class="info-box">
+    <h4>Converted Schema Available</h4>
+    <p>You have a converted schema from the Schema Converter. You can use it directly for data generation!</p>
+</div>
+"""
+
+_CONVERTED_SCHEMA_READY_HTML = """
+<div class="option-card">
+    <h4>Ready to Generate</h4>
+    <p>Using the schema converted by AI. Review and generate synthetic data.</p>
+</div>
+"""
+
+_SCHEMA_UPLOAD_CARD_HTML = """
+<div class="option-card">
+    <h4>Upload SQL Schema</h4>
+    <p>Upload a .sql or .txt file containing CREATE TABLE statements. 
+    The system will attempt to identify the SQL dialect from the first line (e.g., MySQL, PostgreSQL) 
+    or use AI to normalize it if an LLM service is configured.</p>
+</div>
+"""
+
+_EXISTING_DATA_CARD_HTML = """
+<div class="option-card">
+    <h3>Analyze & Replicate Existing Data</h3>
+    <p>Upload your CSV or Excel files. The system will analyze data patterns and generate synthetic data that maintains similar distributions and characteristics.</p>
+</div>
+"""
+
+_GENERATION_SUCCESS_HTML = """
+<div class="success-box">
+    <h3>Synthetic Data Generated Successfully!</h3>
+    <p>Your synthetic data has been generated and is ready for download.</p>
+</div>
+"""
+
 def data_generator_page():
     """Main page for data generation functionality."""
     
@@ -112,12 +161,7 @@ def configure_generation_settings():
 def show_converted_schema_option():
     """Show information about the available converted schema."""
     
-    st.markdown("""
-    <div class="info-box">
-        <h4>Converted Schema Available</h4>
-        <p>You have a converted schema from the Schema Converter. You can use it directly for data generation!</p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.html(_CONVERTED_SCHEMA_INFO_HTML)
 
 def converted_schema_flow():
     """Handle data generation from converted schema."""
@@ -127,12 +171,7 @@ def converted_schema_flow():
     col1, col2 = st.columns([3, 1])
     
     with col1:
-        st.markdown("""
-        <div class="option-card">
-            <h4>Ready to Generate</h4>
-            <p>Using the schema converted by AI. Review and generate synthetic data.</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.html(_CONVERTED_SCHEMA_READY_HTML)
         
         # Display the schema
         with st.expander("Review Converted Schema", expanded=True):
@@ -172,14 +211,7 @@ def schema_generation_flow():
     col1, col2 = st.columns([3, 1])
     
     with col1:
-        st.markdown("""
-        <div class="option-card">
-            <h4>Upload SQL Schema</h4>
-            <p>Upload a .sql or .txt file containing CREATE TABLE statements. 
-            The system will attempt to identify the SQL dialect from the first line (e.g., MySQL, PostgreSQL) 
-            or use AI to normalize it if an LLM service is configured.</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.html(_SCHEMA_UPLOAD_CARD_HTML)
         
         uploaded_schema_file = st.file_uploader(
             "Upload your SQL schema file",
@@ -190,7 +222,7 @@ def schema_generation_flow():
     
     with col2:
         st.markdown("### Sample & Help")
-        sample_schema = create_sample_schema() # Assuming this provides a generic sample
+        sample_schema = get_sample_schema()
         with st.expander("View Sample Schema Template"):
             st.code(sample_schema, language='sql')
         
@@ -206,18 +238,19 @@ def schema_generation_flow():
             st.info("Upload a schema file. If a schema was converted in the 'Schema Converter' tab, it can also be used.")
     
     if uploaded_schema_file is not None:
-        schema_content_raw = uploaded_schema_file.read().decode('utf-8')
+        # The parser decodes bytes itself; text is only needed for the AI path
+        schema_content_raw = uploaded_schema_file.getvalue()
         
         llm_service = st.session_state.get('llm_service')
         
         # Try to parse first to see if dialect is already specified by the user on the first line
-        parser_check = SchemaParser()
-        pre_parsed_output = parser_check.parse_schema(schema_content_raw)
+        pre_parsed_output = get_schema_parser().parse_schema(schema_content_raw)
         dialect_from_user = pre_parsed_output.get('dialect')
 
         if dialect_from_user:
             st.info(f"Dialect '{dialect_from_user}' detected from the first line of your file. Processing with this dialect.")
-            process_schema(schema_content_raw, st.session_state.get('num_samples', 1000))
+            process_schema(schema_content_raw, st.session_state.get('num_samples', 1000),
+                           parsed_output=pre_parsed_output)
         elif llm_service and llm_service.is_configured:
             st.info("No dialect specified on the first line. Using AI to process and standardize the schema.")
             current_model_config = st.session_state.get('model_config', LLMConfig.DEFAULT_CONFIG.copy())
@@ -229,12 +262,17 @@ def schema_generation_flow():
             target_dialect_for_llm_processing = st.session_state.get('target_dialect_llm', "MySQL") # Could be a user setting
 
             with st.spinner("AI is processing and standardizing your schema... This may take a moment."):
-                success, normalized_schema_with_dialect, validation_msg, _, _ = \
-                    llm_service.convert_schema(
-                        schema_content_raw, 
-                        target_dialect_for_llm_processing, # Ask LLM to aim for this output format
-                        current_model_config
-                    )
+                # Stream the response into a placeholder so output shows up as it arrives
+                stream_placeholder = st.empty()
+                # Sync streaming path: the shared client's async connection pool is bound to
+                # the first event loop, so asyncio.run per call would break later requests
+                success, normalized_schema_with_dialect, validation_msg, _, _ = llm_service.convert_schema(
+                    SchemaParser.decode_schema(schema_content_raw), 
+                    target_dialect_for_llm_processing, # Ask LLM to aim for this output format
+                    current_model_config,
+                    on_text=lambda text: stream_placeholder.code(text, language='sql')
+                )
+                stream_placeholder.empty()
             
             if success and normalized_schema_with_dialect:
                 st.success(f"Schema processed and standardized by AI. {validation_msg}")
@@ -243,22 +281,19 @@ def schema_generation_flow():
             else:
                 st.error(f"AI schema processing failed: {validation_msg or 'Unknown error during AI processing.'}. "
                          "Attempting to parse the original schema directly. Please ensure it's well-formed.")
-                process_schema(schema_content_raw, st.session_state.get('num_samples', 1000))
+                process_schema(schema_content_raw, st.session_state.get('num_samples', 1000),
+                               parsed_output=pre_parsed_output)
         else:
             st.warning("No dialect specified on the first line, and LLM Service is not available/configured. "
                        "Attempting to parse the original schema directly. "
                        "For best results, please ensure the schema is clean or specify the dialect on the first line (e.g., MySQL, PostgreSQL).")
-            process_schema(schema_content_raw, st.session_state.get('num_samples', 1000))
+            process_schema(schema_content_raw, st.session_state.get('num_samples', 1000),
+                           parsed_output=pre_parsed_output)
 
 def existing_data_flow():
     """Handle data generation from existing data analysis."""
     
-    st.markdown("""
-    <div class="option-card">
-        <h3>Analyze & Replicate Existing Data</h3>
-        <p>Upload your CSV or Excel files. The system will analyze data patterns and generate synthetic data that maintains similar distributions and characteristics.</p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.html(_EXISTING_DATA_CARD_HTML)
     
     col1, col2 = st.columns([3, 1])
     
@@ -284,12 +319,26 @@ def existing_data_flow():
     if uploaded_files:
         process_existing_data(uploaded_files, st.session_state.get('num_samples', 1000), st.session_state.get('noise_level', 5))
 
+@st.cache_data(ttl=24 * 60 * 60, show_spinner=False)
+def get_sample_schema() -> str:
+    """Return the sample schema template shown in the help column."""
+    return create_sample_schema()
+
+@st.cache_resource(show_spinner=False)
+def get_schema_parser() -> SchemaParser:
+    """
+    Return the process-wide SchemaParser.
+    
+    The parser memoizes results by content digest, so the dialect pre-check and
+    process_schema share one parse, as do reruns and other sessions.
+    """
+    return SchemaParser()
+
 def validate_schema_quick(schema: str):
     """Quick validation of schema."""
     
     try:
-        parser = SchemaParser()
-        tables = parser.parse_schema(schema)
+        tables = get_schema_parser().parse_schema(schema).get('tables')
         
         if tables:
             st.success(f"Valid schema with {len(tables)} table(s)")
@@ -303,17 +352,23 @@ def validate_schema_quick(schema: str):
     except Exception as e:
         st.error(f"Validation error: {str(e)}")
 
-def process_schema(schema_content: str, num_samples: int):
-    """Process schema content (which may have a dialect prefix) and generate data."""
+def process_schema(schema_content: Union[str, bytes], num_samples: int, parsed_output: Optional[Dict[str, Any]] = None):
+    """
+    Process schema content (which may have a dialect prefix) and generate data.
+    
+    Args:
+        schema_content: Schema text or raw UTF-8 bytes, optionally prefixed with a dialect line
+        num_samples: Number of rows to generate per table
+        parsed_output: Parser output already computed for schema_content, if any
+    """
     
     try:
-        parser = SchemaParser()
-        
         with st.spinner("Parsing schema structure..."):
             # schema_content might have the dialect prefixed either by the user,
             # or by the LLM service in the previous step.
             # SchemaParser's parse_schema method will handle this.
-            parsed_output = parser.parse_schema(schema_content)
+            if parsed_output is None:
+                parsed_output = get_schema_parser().parse_schema(schema_content)
             
             tables = parsed_output.get('tables')
             detected_dialect = parsed_output.get('dialect')
@@ -333,17 +388,16 @@ def process_schema(schema_content: str, num_samples: int):
         
         st.success(f"Schema parsed. Found {len(tables)} table(s) to process.")
         
-        # Optionally display parsed structure for verification
-        with st.expander("Review Parsed Schema Structure (for Data Generation)"):
+        # Optionally display parsed structure for verification. Expander bodies run on
+        # every rerun even when collapsed, so build the tables only on request.
+        if st.checkbox("Review Parsed Schema Structure (for Data Generation)", key="show_parsed_schema"):
             if tables:
                 for table_name, columns in tables.items():
                     st.markdown(f"**Table: `{table_name}`**")
                     # Display column name and the type that DataGenerator will use
-                    cols_data = [{"Column Name": col['name'], 
-                                  "Generator Type": col['type'], 
-                                  "Original SQL Type": col.get('raw_type', 'N/A')} 
-                                 for col in columns]
-                    st.dataframe(pd.DataFrame(cols_data))
+                    st.dataframe(_parsed_columns_frame(tuple(
+                        (col['name'], col['type'], col.get('raw_type', 'N/A')) for col in columns
+                    )))
             else:
                 st.write("No tables were successfully parsed.")
 
@@ -357,17 +411,47 @@ def process_schema(schema_content: str, num_samples: int):
     except Exception as e:
         st.error(f"An error occurred while processing the schema: {str(e)}")
  
+@st.cache_resource(show_spinner=False)
+def get_data_analyzer() -> DataAnalyzer:
+    """
+    Return the process-wide DataAnalyzer.
+    
+    Its analyses are keyed by upload content, so reruns and other sessions that
+    submit the same file reuse the result. Analyses do not depend on the noise
+    level, which is only applied at generation time.
+    """
+    return DataAnalyzer(cache_size=16)
+
+@st.cache_data(show_spinner=False)
+def _parsed_columns_frame(columns: Tuple[Tuple[str, str, str], ...]) -> pd.DataFrame:
+    """Build the parsed-structure table from (name, generator type, SQL type) tuples."""
+    return pd.DataFrame(columns, columns=["Column Name", "Generator Type", "Original SQL Type"])
+
+def _column_summary(column_info: Dict[str, Any]) -> None:
+    """Show the per-column analysis table, marking unique counts measured on a sample."""
+    st.dataframe(pd.DataFrame([
+        {
+            'Column': col,
+            'Type': info.type,
+            'Unique Values': f"~{info.unique_count:,}" if info.unique_estimated else f"{info.unique_count:,}",
+            'Missing %': f"{info.missing_percent:.1f}%"
+        }
+        for col, info in column_info.items()
+    ]), use_container_width=True)
+    if any(info.unique_estimated for info in column_info.values()):
+        st.caption("~ Estimated: distinct values of large columns are counted on a sample of rows.")
+
 def process_existing_data(uploaded_files, num_samples: int, noise_level: int):
     """Process and analyze existing data files."""
     
     try:
-        analyzer = DataAnalyzer()
-        analyzed_data = {}
+        analyzer = get_data_analyzer()
         
         with st.spinner("Analyzing uploaded files..."):
-            for file in uploaded_files:
-                file_analysis = analyzer.analyze_file(file, noise_level/100)
-                analyzed_data[file.name] = file_analysis
+            # Files are independent; parsing and column statistics largely release the GIL
+            with ThreadPoolExecutor(max_workers=max(1, min(8, len(uploaded_files)))) as executor:
+                analyses = list(executor.map(analyzer.analyze_file, uploaded_files))
+            analyzed_data = {file.name: analysis for file, analysis in zip(uploaded_files, analyses)}
         
         # Display analysis results
         st.success(f"Analyzed {len(uploaded_files)} file(s)")
@@ -382,32 +466,18 @@ def process_existing_data(uploaded_files, num_samples: int, noise_level: int):
                         st.write(f"Rows: {sheet_data['rows']}, Columns: {sheet_data['columns']}")
                         
                         # Display column info
-                        col_info = pd.DataFrame([
-                            {
-                                'Column': col,
-                                'Type': info['type'],
-                                'Unique Values': info.get('unique_count', 'N/A'),
-                                'Missing %': f"{info.get('missing_percent', 0):.1f}%"
-                            }
-                            for col, info in sheet_data['column_info'].items()
-                        ])
-                        st.dataframe(col_info, use_container_width=True)
+                        _column_summary(sheet_data['column_info'])
                 else:
                     # Single file (CSV)
                     st.write(f"Rows: {analysis['rows']}, Columns: {analysis['columns']}")
-                    col_info = pd.DataFrame([
-                        {
-                            'Column': col,
-                            'Type': info['type'],
-                            'Unique Values': info.get('unique_count', 'N/A'),
-                            'Missing %': f"{info.get('missing_percent', 0):.1f}%"
-                        }
-                        for col, info in analysis['column_info'].items()
-                    ])
-                    st.dataframe(col_info, use_container_width=True)
+                    _column_summary(analysis['column_info'])
         
         # Generate synthetic data automatically
-        generate_data_from_existing(analyzed_data, num_samples, noise_level)
+        source_digest = hashlib.blake2b(digest_size=16)
+        for file in uploaded_files:
+            source_digest.update(file.name.encode('utf-8') + b"\0")
+            source_digest.update(hashlib.blake2b(file.getbuffer(), digest_size=16).digest())
+        generate_data_from_existing(analyzed_data, num_samples, noise_level, source_digest.hexdigest())
     
     except Exception as e:
         st.error(f"Error analyzing files: {str(e)}")
@@ -416,24 +486,28 @@ def generate_data_from_schema(tables, num_samples: int):
     """Generate synthetic data from schema."""
     
     try:
-        generator = DataGenerator()
-        generated_data = {}
+        # Every rerun (including "Create ZIP Package") reaches this point; reuse the
+        # data if nothing that determines it has changed
+        generation_key = _generation_key("schema", tables, num_samples)
+        if _reuse_generated_data(generation_key):
+            return
         
         progress_bar = st.progress(0)
         status_text = st.empty()
         
-        total_tables = len(tables)
-        
-        for i, (table_name, columns) in enumerate(tables.items()):
-            status_text.text(f"Generating data for table: {table_name}")
-            
-            # Generate data for this table
-            df = generator.generate_from_schema(columns, num_samples)
-            generated_data[table_name] = df
-            
-            progress_bar.progress((i + 1) / total_tables)
+        # One generation job per table, run concurrently
+        jobs = {
+            table_name: functools.partial(
+                DataGenerator.generate_from_schema, columns=columns, num_samples=num_samples
+            )
+            for table_name, columns in tables.items()
+        }
+        generated_data = run_generation_jobs(
+            jobs, lambda table_name: f"Generated data for table: {table_name}", progress_bar, status_text
+        )
         
         st.session_state.generated_data = generated_data
+        st.session_state.generation_key = generation_key
         st.session_state.generation_complete = True
         
         status_text.text("Data generation complete!")
@@ -442,36 +516,56 @@ def generate_data_from_schema(tables, num_samples: int):
     except Exception as e:
         st.error(f"Error generating data: {str(e)}")
 
-def generate_data_from_existing(analyzed_data, num_samples: int, noise_level: int):
-    """Generate synthetic data from existing data analysis."""
+def generate_data_from_existing(analyzed_data, num_samples: int, noise_level: int, source_digest: str):
+    """
+    Generate synthetic data from existing data analysis.
+    
+    Args:
+        analyzed_data: Analyses keyed by file name (and sheet for Excel)
+        num_samples: Number of rows to generate per table
+        noise_level: Noise percentage applied to numeric columns
+        source_digest: Digest of the uploaded files; a rerun with the same files and
+                       settings reuses the previous result
+    """
     
     try:
-        generator = DataGenerator()
-        generated_data = {}
+        generation_key = _generation_key("existing", source_digest, num_samples, noise_level)
+        if _reuse_generated_data(generation_key):
+            return
         
         progress_bar = st.progress(0)
         status_text = st.empty()
         
-        total_files = len(analyzed_data)
-        
-        for i, (filename, analysis) in enumerate(analyzed_data.items()):
-            status_text.text(f"Generating synthetic data for: {filename}")
-            
+        # One generation job per CSV file or Excel sheet, run concurrently
+        jobs = {}
+        for filename, analysis in analyzed_data.items():
             if isinstance(analysis, dict) and 'column_info' not in analysis:
                 # Excel with multiple sheets
-                file_data = {}
-                for sheet_name, sheet_analysis in analysis.items():
-                    df = generator.generate_from_analysis(sheet_analysis, num_samples)
-                    file_data[sheet_name] = df
-                generated_data[filename] = file_data
+                sheets = analysis.items()
             else:
                 # Single CSV file
-                df = generator.generate_from_analysis(analysis, num_samples)
+                sheets = [(None, analysis)]
+            for sheet_name, sheet_analysis in sheets:
+                jobs[(filename, sheet_name)] = functools.partial(
+                    DataGenerator.generate_from_analysis, analysis=sheet_analysis,
+                    num_samples=num_samples, noise_level=noise_level / 100
+                )
+        
+        results = run_generation_jobs(
+            jobs,
+            lambda key: f"Generated synthetic data for: {key[0]}" + (f" / {key[1]}" if key[1] is not None else ""),
+            progress_bar, status_text
+        )
+        
+        generated_data = {}
+        for (filename, sheet_name), df in results.items():
+            if sheet_name is None:
                 generated_data[filename] = df
-            
-            progress_bar.progress((i + 1) / total_files)
+            else:
+                generated_data.setdefault(filename, {})[sheet_name] = df
         
         st.session_state.generated_data = generated_data
+        st.session_state.generation_key = generation_key
         st.session_state.generation_complete = True
         
         status_text.text("Data generation complete!")
@@ -480,16 +574,72 @@ def generate_data_from_existing(analyzed_data, num_samples: int, noise_level: in
     except Exception as e:
         st.error(f"Error generating synthetic data: {str(e)}")
 
+def _generation_key(*parts: Any) -> str:
+    """
+    Digest of everything that determines a generation result.
+    
+    Generation is reproducible from the session's random_seed, so identical parts
+    and seed mean identical data. The key also names the preview and ZIP caches.
+    """
+    payload = json.dumps([parts, st.session_state.get('random_seed', 42)], sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+def _reuse_generated_data(generation_key: str) -> bool:
+    """Display the session's generated data if it was made from the same inputs; return whether it was."""
+    generated_data = st.session_state.get('generated_data')
+    if generated_data is None or st.session_state.get('generation_key') != generation_key:
+        return False
+    display_generated_data(generated_data)
+    return True
+
+def run_generation_jobs(jobs: Dict[Any, Callable[[DataGenerator], pd.DataFrame]],
+                        describe: Callable[[Any], str], progress_bar, status_text) -> Dict[Any, pd.DataFrame]:
+    """
+    Run independent generation jobs on a thread pool.
+    
+    Each job gets its own DataGenerator seeded from a child of one SeedSequence
+    rooted at the session's random_seed, so results are reproducible regardless
+    of completion order. Progress is reported from the script thread as jobs
+    finish.
+    
+    Args:
+        jobs: Mapping of result key to a function taking a DataGenerator
+        describe: Builds the status message for a finished key
+        progress_bar: Streamlit progress bar to update
+        status_text: Streamlit placeholder for status messages
+        
+    Returns:
+        Results keyed like jobs, in the same order
+    """
+    seeds = np.random.SeedSequence(st.session_state.get('random_seed', 42)).spawn(len(jobs))
+    results = {}
+    
+    with ThreadPoolExecutor(max_workers=max(1, min(8, len(jobs)))) as executor:
+        futures = {
+            executor.submit(_run_generation_job, job, seed): key
+            for (key, job), seed in zip(jobs.items(), seeds)
+        }
+        # Each widget update is a websocket round-trip; report about 20 times in total
+        report_every = max(1, len(jobs) // 20)
+        for done, future in enumerate(as_completed(futures), start=1):
+            key = futures[future]
+            results[key] = future.result()
+            if done % report_every == 0 or done == len(jobs):
+                status_text.text(describe(key))
+                progress_bar.progress(done / len(jobs))
+    
+    return {key: results[key] for key in jobs}
+
+def _run_generation_job(job: Callable[[DataGenerator], pd.DataFrame], seed: np.random.SeedSequence) -> pd.DataFrame:
+    """Worker body: build a generator for this job's seed and run the job."""
+    return job(DataGenerator(seed))
+
 def display_generated_data(generated_data):
     """Display generated data with preview and download options."""
     
-    st.markdown("""
-    <div class="success-box">
-        <h3>Synthetic Data Generated Successfully!</h3>
-        <p>Your synthetic data has been generated and is ready for download.</p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.html(_GENERATION_SUCCESS_HTML)
     
+    generation_key = st.session_state.get('generation_key')
     with st.expander("Preview Generated Data", expanded=True):
         # Display preview of generated data
         for name, data in generated_data.items():
@@ -497,10 +647,10 @@ def display_generated_data(generated_data):
             if isinstance(data, dict):  # Multiple sheets/tables
                 for sheet_name, df in data.items():
                     st.markdown(f"**{sheet_name}**")
-                    st.dataframe(df.head(10), use_container_width=True)
+                    st.dataframe(_preview(generation_key, (name, sheet_name), df), use_container_width=True)
                     st.caption(f"Shape: {df.shape[0]} rows × {df.shape[1]} columns")
             else:  # Single dataframe
-                st.dataframe(data.head(10), use_container_width=True)
+                st.dataframe(_preview(generation_key, (name, None), data), use_container_width=True)
                 st.caption(f"Shape: {data.shape[0]} rows × {data.shape[1]} columns")
     
     # Download section
@@ -508,8 +658,22 @@ def display_generated_data(generated_data):
     
     # ZIP download with all files
     st.markdown("**Package**")
+    st.caption("Every table is included as Parquet. CSV and Excel copies are optional.")
+    format_cols = st.columns(3)
+    with format_cols[0]:
+        include_csv = st.checkbox("Include CSV", value=True, key="zip_include_csv")
+    with format_cols[1]:
+        include_excel = st.checkbox("Include Excel", value=True, key="zip_include_excel")
+    with format_cols[2]:
+        fast_zip = st.checkbox(
+            "Fast (uncompressed) ZIP",
+            value=False,
+            help="Store files without compression. Much faster for large outputs, but the ZIP is bigger."
+        )
     if st.button("Create ZIP Package", key="create_zip"):
-        zip_buffer_value = create_zip_download(generated_data)
+        zip_buffer_value = _zip_cache(
+            st.session_state.get('generation_key'), not fast_zip, include_csv, include_excel, generated_data
+        )
         st.session_state.zip_buffer_for_download = zip_buffer_value
         st.success("ZIP package created and ready for download!")
 
@@ -522,36 +686,178 @@ def display_generated_data(generated_data):
             key="download_zip_final"
         )
 
-def create_zip_download(generated_data):
-    """Create ZIP file containing all generated data."""
+@st.cache_resource(show_spinner=False, max_entries=64)
+def _preview(generation_key: str, table_key: Tuple[str, Optional[str]], _df: pd.DataFrame):
+    """
+    Return the first rows of a generated table as an Arrow table, once per generation key.
+    
+    The key is derived from the generation inputs (see _generation_key), so reruns
+    that show the same data hit the cache. Handing st.dataframe an Arrow table
+    skips its pandas conversion on every rerun.
+    Frames Arrow cannot convert are previewed as a plain DataFrame head.
+    """
+    head = _df.head(10)
+    try:
+        return pa.Table.from_pandas(head, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        return head
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _zip_cache(generation_key: str, compress: bool, include_csv: bool, include_excel: bool,
+               _data_ref) -> bytes:
+    """
+    Build the ZIP package once per generation run.
+    
+    The key is derived from the generation inputs, which determine the data, so
+    the DataFrames themselves (passed unhashed as _data_ref) never need to be
+    hashed or re-serialized.
+    """
+    return create_zip_download(
+        _data_ref, compress=compress, include_csv=include_csv, include_excel=include_excel
+    )
+
+def create_zip_download(generated_data, compress: bool = True, include_csv: bool = True,
+                        include_excel: bool = True):
+    """
+    Create ZIP file containing all generated data.
+    
+    Every table is written as zstd-compressed Parquet; CSV and Excel copies
+    are optional.
+    
+    Args:
+        generated_data: Generated DataFrames keyed by file or table name
+        compress: Deflate text members at level 1 when True, store uncompressed when False
+        include_csv: Also add a CSV copy of each table
+        include_excel: Also add an Excel workbook per file
+        
+    Returns:
+        ZIP archive bytes
+    """
     
     zip_buffer = io.BytesIO()
     
-    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+    # Level 1 deflate is several times faster than the default level 6 on CSV text
+    if compress:
+        zip_options = {'compression': zipfile.ZIP_DEFLATED, 'compresslevel': 1}
+    else:
+        zip_options = {'compression': zipfile.ZIP_STORED}
+    
+    with zipfile.ZipFile(zip_buffer, 'w', **zip_options) as zip_file, \
+            tempfile.TemporaryDirectory() as tmp_dir:
         for name, data in generated_data.items():
             if isinstance(data, dict):
                 # Excel file with multiple sheets
-                excel_buffer = io.BytesIO()
-                with pd.ExcelWriter(excel_buffer, engine='xlsxwriter') as writer:
-                    for sheet_name, df in data.items():
-                        df.to_excel(writer, sheet_name=sheet_name, index=False)
+                for sheet_name, df in data.items():
+                    _write_parquet_to_zip(zip_file, f"parquet/synthetic_{name}_{sheet_name}.parquet", df)
                 
-                zip_file.writestr(f"synthetic_{name}", excel_buffer.getvalue())
+                if include_excel:
+                    _write_excel_to_zip(zip_file, f"synthetic_{name}", data, tmp_dir)
                 
                 # Also add individual CSV files
-                for sheet_name, df in data.items():
-                    csv_data = df.to_csv(index=False)
-                    zip_file.writestr(f"csv/synthetic_{name}_{sheet_name}.csv", csv_data)
+                if include_csv:
+                    for sheet_name, df in data.items():
+                        _write_csv_to_zip(zip_file, f"csv/synthetic_{name}_{sheet_name}.csv", df)
             else:
                 # CSV file
-                csv_data = data.to_csv(index=False)
                 clean_name = name.replace('.csv', '').replace('.xlsx', '').replace('.xls', '')
-                zip_file.writestr(f"synthetic_{clean_name}.csv", csv_data)
+                _write_parquet_to_zip(zip_file, f"synthetic_{clean_name}.parquet", data)
+                
+                if include_csv:
+                    _write_csv_to_zip(zip_file, f"synthetic_{clean_name}.csv", data)
                 
                 # Also create Excel version
-                excel_buffer = io.BytesIO()
-                with pd.ExcelWriter(excel_buffer, engine='xlsxwriter') as writer:
-                    data.to_excel(writer, sheet_name='Data', index=False)
-                zip_file.writestr(f"excel/synthetic_{clean_name}.xlsx", excel_buffer.getvalue())
+                if include_excel:
+                    _write_excel_to_zip(zip_file, f"excel/synthetic_{clean_name}.xlsx", {'Data': data}, tmp_dir)
+    
+    return zip_buffer.getvalue()
+
+def _write_parquet_to_zip(zip_file: zipfile.ZipFile, arcname: str, df: pd.DataFrame) -> None:
+    """
+    Write a DataFrame as Parquet into a stored (uncompressed) ZIP member.
+    
+    Parquet pages are already zstd-compressed, so deflating them again only
+    costs time.
+    
+    Args:
+        zip_file: Open ZIP archive to write into
+        arcname: Path of the member inside the archive
+        df: Data to write
+    """
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        # Mixed-type object columns: store them as text
+        object_cols = {col: 'string' for col in df.columns if df[col].dtype == object}
+        table = pa.Table.from_pandas(df.astype(object_cols), preserve_index=False)
+    
+    member = zipfile.ZipInfo(arcname, date_time=time.localtime()[:6])
+    member.compress_type = zipfile.ZIP_STORED
+    with zip_file.open(member, 'w', force_zip64=True) as out:
+        pq.write_table(table, out, compression='zstd')
+
+def _write_csv_to_zip(zip_file: zipfile.ZipFile, arcname: str, df: pd.DataFrame) -> None:
+    """
+    Stream a DataFrame as CSV into a ZIP member without building the full text in memory.
+    
+    Uses PyArrow's native CSV writer, falling back to pandas for columns Arrow
+    cannot convert (e.g. mixed-type object columns).
+    
+    Args:
+        zip_file: Open ZIP archive to write into
+        arcname: Path of the member inside the archive
+        df: Data to write
+    """
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        table = None
+    
+    with zip_file.open(arcname, 'w', force_zip64=True) as member:
+        if table is not None:
+            pacsv.write_csv(_whole_second_timestamps(table), member)
+        else:
+            with io.TextIOWrapper(member, encoding='utf-8', newline='') as text:
+                df.to_csv(text, index=False)
+
+def _whole_second_timestamps(table: pa.Table) -> pa.Table:
+    """
+    Cast timestamp columns without sub-second values to second resolution.
     
-    return zip_buffer.getvalue()
\ No newline at end of file
+    Arrow prints every fractional digit of the column's unit, while pandas omits
+    them when all are zero ("13:35:03" rather than "13:35:03.000000").
+    
+    Args:
+        table: Table about to be written as CSV
+        
+    Returns:
+        Table with whole-second timestamp columns stored at second resolution
+    """
+    for i, field in enumerate(table.schema):
+        if pa.types.is_timestamp(field.type) and field.type.unit != 's':
+            try:
+                # A safe cast fails instead of truncating values with sub-second parts
+                column = table.column(i).cast(pa.timestamp('s', tz=field.type.tz), safe=True)
+            except pa.ArrowInvalid:
+                continue
+            table = table.set_column(i, field.with_type(column.type), column)
+    return table
+
+def _write_excel_to_zip(zip_file: zipfile.ZipFile, arcname: str, sheets: Dict[str, pd.DataFrame],
+                        tmp_dir: str) -> None:
+    """
+    Write sheets to an Excel workbook on disk, then copy it into the ZIP.
+    
+    Args:
+        zip_file: Open ZIP archive to write into
+        arcname: Path of the member inside the archive
+        sheets: Mapping of sheet name to data
+        tmp_dir: Scratch directory for the workbook file
+    """
+    path = os.path.join(tmp_dir, 'workbook.xlsx')
+    # Skip per-string URL/formula detection; generated values are plain data.
+    # constant_memory is not usable here: pandas emits cells column by column.
+    options = {'strings_to_urls': False, 'strings_to_formulas': False}
+    with pd.ExcelWriter(path, engine='xlsxwriter', engine_kwargs={'options': options}) as writer:
+        for sheet_name, df in sheets.items():
+            df.to_excel(writer, sheet_name=sheet_name, index=False)
+    zip_file.write(path, arcname=arcname)
\ No newline at end of file
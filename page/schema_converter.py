@@ -1,5 +1,6 @@
 import streamlit as st
-from services.llm_service import LLMService
+import codecs
+from services.llm_service import get_llm_service
 from config.llm_config import LLMConfig
 from schema_parser import SchemaParser
 import pandas as pd
@@ -9,7 +10,7 @@ def schema_converter_page():
     
     # Initialize LLM service
     if 'llm_service' not in st.session_state:
-        st.session_state.llm_service = LLMService()
+        st.session_state.llm_service = get_llm_service()
     
     # Main layout with AI configuration and schema input
     col1, col2 = st.columns([2, 1])
@@ -32,7 +33,7 @@ def schema_converter_page():
     
     # Initialize LLM service
     if 'llm_service' not in st.session_state:
-        st.session_state.llm_service = LLMService()
+        st.session_state.llm_service = get_llm_service()
 
     # AI Configuration Expander
     with st.expander("AI Configuration", expanded=True):
@@ -149,6 +150,7 @@ def schema_input_section():
         )
 
     schema_input = ""
+    uploaded_file = None
 
     if input_method == "Upload File":
         uploaded_file = st.file_uploader(
@@ -159,10 +161,10 @@ def schema_input_section():
         
         if uploaded_file:
             try:
-                schema_input = uploaded_file.read().decode('utf-8')
+                # Only the preview is decoded here; the full file is decoded on conversion
                 st.text_area(
                     "File content preview:",
-                    value=schema_input[:1000] + ("..." if len(schema_input) > 1000 else ""),
+                    value=upload_preview(uploaded_file),
                     height=200,
                     disabled=True
                 )
@@ -189,22 +191,70 @@ Orders connect customers to products with quantities and dates."
         )
     
     # Conversion button
-    if schema_input and output_format and st.button("Convert Schema", type="primary"):
+    if (schema_input or uploaded_file) and output_format and st.button("Convert Schema", type="primary"):
         if not hasattr(st.session_state, 'model_config'):
             st.error("Please configure the AI settings first.")
             return
         
+        if uploaded_file:
+            try:
+                schema_input = read_uploaded_text(uploaded_file)
+            except Exception as e:
+                st.error(f"Error reading file: {str(e)}")
+                return
+        
         convert_schema(schema_input, output_format)
 
+def upload_preview(uploaded_file, limit: int = 1024) -> str:
+    """
+    Decode only the start of an uploaded file for display.
+    
+    Args:
+        uploaded_file: Streamlit UploadedFile
+        limit: Number of bytes to decode
+        
+    Returns:
+        Preview text, with "..." appended when the file is longer than limit
+    """
+    # The incremental decoder holds back a multi-byte character cut off at the limit
+    decoder = codecs.getincrementaldecoder('utf-8-sig')()
+    preview = decoder.decode(uploaded_file.getbuffer()[:limit], final=False)
+    return preview + ("..." if uploaded_file.size > limit else "")
+
+def read_uploaded_text(uploaded_file) -> str:
+    """
+    Decode an uploaded file as UTF-8, reusing the result across reruns.
+    
+    Args:
+        uploaded_file: Streamlit UploadedFile
+        
+    Returns:
+        Decoded file content
+    """
+    # file_id changes on every upload, even when a same-sized file is re-uploaded
+    cache_key = uploaded_file.file_id
+    cached = st.session_state.get('uploaded_schema_text')
+    if cached and cached[0] == cache_key:
+        return cached[1]
+    
+    # Decode straight from the upload's buffer rather than a bytes copy of it
+    text = str(uploaded_file.getbuffer(), 'utf-8-sig')
+    st.session_state.uploaded_schema_text = (cache_key, text)
+    return text
+
 def convert_schema(input_schema: str, output_format: str):
     """Convert the input schema using LLM."""
     
     with st.spinner("Converting schema using AI..."):
+        # Show the SQL as it streams in; validation runs once the stream ends
+        stream_placeholder = st.empty()
         success, converted_schema, error_message, is_suitable_for_data_gen, construct_counts = st.session_state.llm_service.convert_schema(
             input_schema,
             output_format,
-            st.session_state.model_config
+            st.session_state.model_config,
+            on_text=lambda text: stream_placeholder.code(text, language="sql")
         )
+        stream_placeholder.empty()
         
         st.session_state.converted_schema = converted_schema # Store even on failure if partial is returned
         st.session_state.is_suitable_for_data_gen = is_suitable_for_data_gen
@@ -233,14 +283,14 @@ def examples_and_help_section():
     with st.expander("Example Schemas"):
         example_type = st.selectbox(
             "Choose example:",
-            list(LLMConfig.EXAMPLE_SCHEMAS.keys()),
+            LLMConfig.get_example_names(),
             key="example_selector"
         )
         
-        st.code(LLMConfig.EXAMPLE_SCHEMAS[example_type], language='sql', wrap_lines=True)
+        st.code(LLMConfig.get_example(example_type), language='sql', wrap_lines=True)
         
         if st.button(f"Use {example_type} Example", key="use_example"):
-            st.session_state.converted_schema = LLMConfig.EXAMPLE_SCHEMAS[example_type]
+            st.session_state.converted_schema = LLMConfig.get_example(example_type)
             st.success("Example loaded! Check the results below.")
     
     # Input format help
@@ -292,16 +342,19 @@ def display_conversion_results():
         </div>
         """, unsafe_allow_html=True)
         
-        # Display the converted schema
-        edited_schema = st.text_area(
-            "Generated SQL Schema:",
-            value=st.session_state.get('converted_schema', ''), 
-            height=400,
-            key="text_area_converted_schema", 
-            help="You can edit the schema before using it for data generation"
-        )
+        # Display the converted schema. Edits are batched in a form so typing in a
+        # large schema does not rerun the page; they apply on "Save edits".
+        with st.form("converted_schema_form", border=False):
+            edited_schema = st.text_area(
+                "Generated SQL Schema:",
+                value=st.session_state.get('converted_schema', ''), 
+                height=400,
+                key="text_area_converted_schema", 
+                help="You can edit the schema before using it for data generation"
+            )
+            edits_submitted = st.form_submit_button("Save edits")
         
-        if edited_schema != st.session_state.get('converted_schema', ''):
+        if edits_submitted and edited_schema != st.session_state.get('converted_schema', ''):
             st.session_state.converted_schema = edited_schema
             # Re-validate or at least clear suitability if user edits manually
             # For simplicity, we'll let the existing validation button handle re-validation.
@@ -412,13 +465,23 @@ def get_schema_suggestions(schema: str):
         return
     
     with st.spinner("🤖 Analyzing schema for improvements..."):
+        # Render suggestions as they stream in
+        heading_placeholder = st.empty()
+        stream_placeholder = st.empty()
+        
+        def show_partial(text: str):
+            heading_placeholder.markdown("### 💡 Improvement Suggestions:")
+            stream_placeholder.markdown(text)
+        
         success, suggestions = st.session_state.llm_service.get_improvement_suggestions(
             schema, 
-            st.session_state.model_config
+            st.session_state.model_config,
+            on_text=show_partial
         )
         
         if success:
-            st.markdown("### 💡 Improvement Suggestions:")
-            st.markdown(suggestions)
+            show_partial(suggestions)
         else:
+            heading_placeholder.empty()
+            stream_placeholder.empty()
             st.error(f"❌ Failed to get suggestions: {suggestions}")
\ No newline at end of file
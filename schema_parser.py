@@ -1,180 +1,300 @@
+import functools
+import hashlib
 import re
-from typing import Dict, List, Any
+import threading
+from collections import OrderedDict
+import numpy as np
+from typing import Dict, Iterator, List, Any, Optional, Tuple, Union
+
+# Regex to find the start of a CREATE TABLE statement, up to its opening parenthesis.
+# Handles optional schema names and backticks.
+# Example: CREATE TABLE `tableName` (...) or CREATE TABLE schemaName.tableName (...)
+# The closing ");" is matched separately so each body search stops at the next
+# CREATE TABLE; an unterminated statement cannot make a lazy body scan run to the
+# end of the text once per statement (quadratic on malformed input).
+TABLE_HEADER_RE = re.compile(
+    r"CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?(?:`?(\w+)`?\.)?`?(\w+)`?\s*\(",
+    re.IGNORECASE
+)
+TABLE_END_RE = re.compile(r"\)\s*;")
+# Basic column parsing - this would need to be more robust for production
+# This simplified version extracts name and type.
+COLUMN_RE = re.compile(
+    r"^\s*`?(\w+)`?\s+([\w\s]+(?:\([\d,\s]*\))?)([^,]*?)(?:,|\n|$)", 
+    re.IGNORECASE | re.MULTILINE
+)
+# Cheap pre-check so input without any CREATE TABLE skips the full scan
+CREATE_TABLE_HINT_RE = re.compile(r"CREATE\s+TABLE", re.IGNORECASE)
+# Comment markers around a dialect name on the first line: "-- MySQL", "# MySQL", "/* MySQL */"
+# Stripped with str.strip; a regex is overkill for one short line
+DIALECT_MARKER_CHARS = "-#/* \t\r\n\f\v"
+# All comment forms in one alternation so comments are stripped in a single left-to-right
+# pass. Line comments (-- and #) keep their newline via group 1; block comments vanish.
+COMMENT_RE = re.compile(r"(?:--|#)[^\n]*(\n|\Z)|/\*.*?\*/", re.DOTALL)
+DATA_TYPE_SIZE_RE = re.compile(r'([a-zA-Z]+)(?:\(([^)]+)\))?')
+DEFAULT_VALUE_RE = re.compile(r'DEFAULT\s+([^,\s]+)')
+
+# (keyword, constraint tag) pairs checked against a column's upper-cased definition
+CONSTRAINT_PATTERNS = (
+    ('NOT NULL', 'not_null'),
+    ('PRIMARY KEY', 'primary_key'),
+    ('UNIQUE', 'unique'),
+    ('AUTO_INCREMENT', 'auto_increment'),
+    ('IDENTITY', 'auto_increment'),
+    ('DEFAULT', 'default')
+)
+
+def _split_top_level_commas(text: str) -> List[str]:
+    """
+    Split text on commas that are not nested inside parentheses.
+    
+    The paren depth at every byte is a cumulative sum over the UTF-8 bytes, so the
+    split points are found with vectorized NumPy operations instead of a Python
+    loop over characters. Commas and parentheses are single bytes in UTF-8, so
+    slicing the encoded text at those positions is safe.
+    
+    Args:
+        text: Text between a table's outer parentheses
+        
+    Returns:
+        Non-empty, stripped pieces in order
+    """
+    raw = text.encode('utf-8')
+    arr = np.frombuffer(raw, dtype=np.uint8)
+    depth = np.cumsum((arr == ord('(')).astype(np.int32) - (arr == ord(')')))
+    splits = np.flatnonzero((arr == ord(',')) & (depth == 0)).tolist()
+    
+    pieces = []
+    start = 0
+    for end in splits + [len(raw)]:
+        piece = raw[start:end].decode('utf-8').strip()
+        if piece:
+            pieces.append(piece)
+        start = end + 1
+    return pieces
+
+# Exact base type name -> DataGenerator type, for the spellings real schemas use.
+# One dict probe on the leading type token replaces the substring cascade below.
+TYPE_NAME_MAP = {
+    **dict.fromkeys(("int", "integer", "tinyint", "smallint", "mediumint", "bigint",
+                     "serial", "smallserial", "bigserial"), "integer"),
+    **dict.fromkeys(("char", "varchar", "nchar", "nvarchar", "varchar2", "nvarchar2",
+                     "text", "tinytext", "mediumtext", "longtext", "clob"), "string"),
+    **dict.fromkeys(("float", "double", "real", "decimal", "numeric"), "float"),
+    "date": "date",
+    **dict.fromkeys(("datetime", "datetime2", "smalldatetime", "timestamp", "timestamptz"), "datetime"),
+    **dict.fromkeys(("bool", "boolean"), "boolean"),
+}
+
+@functools.lru_cache(maxsize=1024)
+def _classify_type(raw_type: str) -> str:
+    """
+    Map a raw SQL type (e.g. VARCHAR(255), INT, DECIMAL(10,2)) to a DataGenerator type.
+    
+    Real schemas reuse a handful of type spellings, so results are memoized and
+    each distinct spelling is classified once. Known base type names resolve with
+    a single lookup; anything else goes through the keyword cascade.
+    """
+    data_type_lower = raw_type.lower()
+    token_match = DATA_TYPE_SIZE_RE.match(data_type_lower)
+    if token_match and token_match.group(1) in TYPE_NAME_MAP:
+        return TYPE_NAME_MAP[token_match.group(1)]
+    
+    col_type_norm = "string" # Default
+    if "int" in data_type_lower:
+        col_type_norm = "integer"
+    elif "char" in data_type_lower or "text" in data_type_lower:
+        col_type_norm = "string"
+    elif "float" in data_type_lower or "double" in data_type_lower or "real" in data_type_lower:
+        col_type_norm = "float"
+    elif "decimal" in data_type_lower or "numeric" in data_type_lower:
+        col_type_norm = "float" # Or a specific "decimal" type if DataGenerator handles it
+    elif "datetime" in data_type_lower or "timestamp" in data_type_lower:
+        col_type_norm = "datetime"
+    elif "date" == data_type_lower or (data_type_lower.startswith("date") and '(' not in data_type_lower) : # avoid date() function
+        col_type_norm = "date"
+    elif "bool" in data_type_lower:
+        col_type_norm = "boolean"
+    return col_type_norm
+
+KNOWN_DIALECTS = ["MySQL", "PostgreSQL", "SQLite", "MS SQL Server", "Oracle", "MariaDB"] # Expanded list
+# Lower-cased dialect name -> original casing
+_DIALECT_BY_NAME = {dialect.lower(): dialect for dialect in KNOWN_DIALECTS}
+# Prefixes of table-level constraint lines inside a CREATE TABLE body
+TABLE_CONSTRAINT_PREFIXES = (
+    "PRIMARY KEY", "FOREIGN KEY", "UNIQUE", "CONSTRAINT", "CHECK", "INDEX", "KEY", "TABLESPACE"
+)
+
+def remove_comments(content: str) -> str:
+    """Remove SQL comments from content."""
+    # Single pass over -- and # line comments (# is common in MySQL) and /* ... */ blocks
+    return COMMENT_RE.sub(r"\1", content).strip()
+
+def parse_columns(columns_text: str) -> List[Dict[str, Any]]:
+    """
+    Parse column definitions from the text within table parentheses.
+    This is a simplified example. A robust parser would handle constraints, 
+    data type parameters (VARCHAR(255), DECIMAL(10,2)), etc., in more detail.
+    
+    The caller passes text that is already comment-free: parse_schema_text strips
+    comments from the whole schema before matching tables.
+    """
+    columns = []
+    
+    # Split column definitions on commas outside parentheses, so types like
+    # DECIMAL(10, 2) stay intact.
+    for col_def_full in _split_top_level_commas(columns_text):
+        col_def_full = col_def_full.strip()
+        # Skip lines that are likely constraints defined separately (PRIMARY KEY, FOREIGN KEY, etc.)
+        if not col_def_full or col_def_full.upper().startswith(TABLE_CONSTRAINT_PREFIXES):
+            continue
+
+        match = COLUMN_RE.match(col_def_full)
+        if match:
+            name = match.group(1).strip('`')
+            raw_type_full = match.group(2).strip() # e.g., VARCHAR(255), INT, DECIMAL(10,2)
+            
+            columns.append({
+                'name': name,
+                # Basic type normalization, mapped to types understood by DataGenerator
+                'type': _classify_type(raw_type_full),
+                'raw_type': raw_type_full,
+                'params': {}, # Placeholder for future detailed parsing of type parameters
+                'constraints': [] # Placeholder for future detailed parsing of constraints
+            })
+    return columns
+
+def iter_table_definitions(content: str) -> Iterator[Tuple[Optional[str], str, str]]:
+    """
+    Yield (schema_name, table_name, columns_text) for each CREATE TABLE statement.
+    
+    A statement missing its closing ");" is skipped instead of absorbing the
+    statements that follow it.
+    """
+    headers = list(TABLE_HEADER_RE.finditer(content))
+    for i, header in enumerate(headers):
+        limit = headers[i + 1].start() if i + 1 < len(headers) else len(content)
+        end = TABLE_END_RE.search(content, header.end(), limit)
+        if end:
+            yield header.group(1), header.group(2), content[header.end():end.start()]
+
+def parse_schema_text(schema_content: str) -> Dict[str, Any]:
+    """
+    Parse decoded SQL schema text without any caching.
+    
+    Args:
+        schema_content: SQL CREATE TABLE statements, optionally prefixed with a
+                        dialect name on the first line (e.g., "MySQL", "-- PostgreSQL").
+        
+    Returns:
+        Dictionary with 'tables' (table names as keys and column definitions as values)
+        and 'dialect' (detected dialect string or None)
+    """
+    tables = {}
+    # Only the first line is needed to sniff the dialect, so avoid splitting the whole schema
+    first_line = schema_content.partition("\n")[0]
+    # Clean the first line from common comment markers for dialect detection
+    # Handles "-- MySQL", "# MySQL", "/* MySQL */"
+    first_line_cleaned_for_dialect = first_line.strip(DIALECT_MARKER_CHARS)
+    detected_dialect = _DIALECT_BY_NAME.get(first_line_cleaned_for_dialect.lower())
+    
+    # Fast path: nothing to extract, so skip comment removal and the table regex
+    if not CREATE_TABLE_HINT_RE.search(schema_content):
+        return {'tables': tables, 'dialect': detected_dialect}
+    
+    # The dialect line needs no special handling: as a comment it is stripped, and as
+    # a bare name it cannot match a CREATE TABLE statement. Comment removal and the
+    # table search are then the only full passes over the text.
+    # Tables are handed over one at a time instead of materializing every
+    # columns_text substring up front
+    for db_schema_name, table_name_str, columns_text_str in iter_table_definitions(remove_comments(schema_content)):
+        
+        actual_table_name = table_name_str.strip().lower().replace('`', '')
+        if db_schema_name: # Prepend schema name if present
+            actual_table_name = f"{db_schema_name.strip().lower().replace('`', '')}.{actual_table_name}"
+        
+        columns = parse_columns(columns_text_str)
+        if columns: # Only add table if columns were successfully parsed
+            tables[actual_table_name] = columns
+    
+    return {'tables': tables, 'dialect': detected_dialect}
+
 
 class SchemaParser:
-    """Parse SQL schema files and extract table definitions."""
+    """
+    Parse SQL schema files and extract table definitions.
+    
+    Parsing itself is done by the stateless module-level functions; an instance
+    only adds an LRU of recent results keyed by content digest.
+    """
     
-    KNOWN_DIALECTS = ["MySQL", "PostgreSQL", "SQLite", "MS SQL Server", "Oracle", "MariaDB"] # Expanded list
+    KNOWN_DIALECTS = KNOWN_DIALECTS
 
-    def __init__(self):
-        # Regex to find CREATE TABLE statements. Handles optional schema names and backticks.
-        # Example: CREATE TABLE `tableName` (...) or CREATE TABLE schemaName.tableName (...)
-        self.table_pattern = re.compile(
-            r"CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?(?:`?(\w+)`?\.?)?`?(\w+)`?\s*\((.*?)\)\s*;",
-            re.IGNORECASE | re.DOTALL
-        )
-        # Basic column parsing - this would need to be more robust for production
-        # This simplified version extracts name and type.
-        self.column_pattern = re.compile(
-            r"^\s*`?(\w+)`?\s+([\w\s]+(?:\([\d,\s]*\))?)([^,]*?)(?:,|\n|$)", 
-            re.IGNORECASE | re.MULTILINE
-        )
+    # Compiled once at import and shared by all instances
+    table_pattern = TABLE_HEADER_RE
+    column_pattern = COLUMN_RE
+    create_table_hint = CREATE_TABLE_HINT_RE
     
-    def parse_schema(self, schema_content: str) -> Dict[str, Any]:
+    def __init__(self, cache_size: int = 32):
+        # Parse results of recently seen schemas, keyed by content digest
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+    
+    @staticmethod
+    def decode_schema(schema_content: Union[str, bytes]) -> str:
+        """Return schema text, decoding raw uploads as UTF-8 and dropping any BOM."""
+        if isinstance(schema_content, (bytes, bytearray, memoryview)):
+            return bytes(schema_content).decode('utf-8-sig')
+        return schema_content
+    
+    def parse_schema(self, schema_content: Union[str, bytes]) -> Dict[str, Any]:
         """
         Parse SQL schema content and return table definitions and detected dialect.
         
         Args:
-            schema_content: String containing SQL CREATE TABLE statements,
-                            optionally prefixed with a dialect name on the first line 
+            schema_content: String (or raw UTF-8 bytes) containing SQL CREATE TABLE
+                            statements, optionally prefixed with a dialect name on the first line 
                             (e.g., "MySQL", "-- PostgreSQL", "/* SQLite */").
             
         Returns:
             Dictionary with 'tables' (table names as keys and column definitions as values)
-            and 'dialect' (detected dialect string or None).
+            and 'dialect' (detected dialect string or None). Results are shared
+            between callers that parse identical content and must not be modified.
         """
-        tables = {}
-        detected_dialect = None
-        lines = schema_content.splitlines()
-        content_to_parse = schema_content
-
-        if lines:
-            first_line_stripped = lines[0].strip()
-            # Clean the first line from common comment markers for dialect detection
-            # Handles "-- MySQL", "# MySQL", "/* MySQL */"
-            first_line_cleaned_for_dialect = re.sub(r"^[--#/\*\s]+|\s*[\*/]*$", "", first_line_stripped, flags=re.IGNORECASE)
-
-            for dialect_candidate in self.KNOWN_DIALECTS:
-                if first_line_cleaned_for_dialect.lower() == dialect_candidate.lower():
-                    detected_dialect = dialect_candidate # Store the original casing
-                    # If dialect is found, parse content from the second line onwards
-                    content_to_parse = "\n".join(lines[1:])
-                    break
+        # Streamlit reruns re-submit the same schema; reuse the parse of identical content
+        raw = schema_content.encode('utf-8') if isinstance(schema_content, str) else bytes(schema_content)
+        cache_key = hashlib.blake2b(raw, digest_size=16).digest()
+        with self._cache_lock:
+            if cache_key in self._cache:
+                self._cache.move_to_end(cache_key)
+                return self._cache[cache_key]
         
-        # Remove comments from the actual schema content that will be parsed for tables
-        schema_content_no_comments = self._remove_comments(content_to_parse)
+        result = parse_schema_text(self.decode_schema(schema_content))
         
-        matches = self.table_pattern.findall(schema_content_no_comments)
-
-        for match_groups in matches:
-            # The regex captures: (optional_schema_name, table_name, columns_text)
-            db_schema_name, table_name_str, columns_text_str = match_groups
-            
-            actual_table_name = table_name_str.strip().lower().replace('`', '')
-            if db_schema_name: # Prepend schema name if present
-                actual_table_name = f"{db_schema_name.strip().lower().replace('`', '')}.{actual_table_name}"
-            
-            columns = self._parse_columns(columns_text_str)
-            if columns: # Only add table if columns were successfully parsed
-                tables[actual_table_name] = columns
+        with self._cache_lock:
+            self._cache[cache_key] = result
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
         
-        return {'tables': tables, 'dialect': detected_dialect}
+        return result
+    
+    # The methods below forward to the module-level functions and are kept for existing callers
+    def _parse_schema_text(self, schema_content: str) -> Dict[str, Any]:
+        """Parse decoded schema text; see parse_schema."""
+        return parse_schema_text(schema_content)
     
     def _remove_comments(self, content: str) -> str:
-            """Remove SQL comments from content."""
-            # Remove single-line comments (--)
-            content = re.sub(r"--.*?\n", "\n", content)
-            # Remove single-line comments (#) - common in MySQL
-            content = re.sub(r"#.*?\n", "\n", content)
-            # Remove multi-line comments (/* ... */)
-            content = re.sub(r"/\*.*?\*/", "", content, flags=re.DOTALL)
-            return content.strip()
+        """Remove SQL comments from content."""
+        return remove_comments(content)
     
     def _parse_columns(self, columns_text: str) -> List[Dict[str, Any]]:
-        """
-        Parse column definitions from the text within table parentheses.
-        This is a simplified example. A robust parser would handle constraints, 
-        data type parameters (VARCHAR(255), DECIMAL(10,2)), etc., in more detail.
-        """
-        columns = []
-        
-        # Remove comments from column definitions first
-        columns_text_no_comments = self._remove_comments(columns_text)
-
-        # Split column definitions. A more robust way would be to parse token by token
-        # or use a more advanced regex that handles commas within type definitions (e.g., DECIMAL(10, 2)).
-        # This simple split by comma might break on complex definitions.
-        potential_column_defs = []
-        buffer = ""
-        paren_level = 0
-        for char in columns_text_no_comments:
-            if char == '(':
-                paren_level += 1
-            elif char == ')':
-                paren_level -= 1
-            
-            if char == ',' and paren_level == 0:
-                potential_column_defs.append(buffer.strip())
-                buffer = ""
-            else:
-                buffer += char
-        if buffer.strip():
-            potential_column_defs.append(buffer.strip())
-
-        for col_def_full in potential_column_defs:
-            col_def_full = col_def_full.strip()
-            # Skip lines that are likely constraints defined separately (PRIMARY KEY, FOREIGN KEY, etc.)
-            if not col_def_full or col_def_full.upper().startswith((
-                "PRIMARY KEY", "FOREIGN KEY", "UNIQUE", "CONSTRAINT", "CHECK", "INDEX", "KEY", "TABLESPACE"
-            )):
-                continue
-
-            match = self.column_pattern.match(col_def_full)
-            if match:
-                name = match.group(1).strip('`')
-                raw_type_full = match.group(2).strip() # e.g., VARCHAR(255), INT, DECIMAL(10,2)
-                
-                # Basic type normalization (example)
-                # This should map to types understood by DataGenerator
-                data_type_lower = raw_type_full.lower()
-                col_type_norm = "string" # Default
-                if "int" in data_type_lower:
-                    col_type_norm = "integer"
-                elif "char" in data_type_lower or "text" in data_type_lower:
-                    col_type_norm = "string"
-                elif "float" in data_type_lower or "double" in data_type_lower or "real" in data_type_lower:
-                    col_type_norm = "float"
-                elif "decimal" in data_type_lower or "numeric" in data_type_lower:
-                    col_type_norm = "float" # Or a specific "decimal" type if DataGenerator handles it
-                elif "date" == data_type_lower or (data_type_lower.startswith("date") and '(' not in data_type_lower) : # avoid date() function
-                    col_type_norm = "date"
-                elif "datetime" in data_type_lower or "timestamp" in data_type_lower:
-                    col_type_norm = "datetime"
-                elif "bool" in data_type_lower:
-                    col_type_norm = "boolean"
-
-                columns.append({
-                    'name': name,
-                    'type': col_type_norm,
-                    'raw_type': raw_type_full,
-                    'params': {}, # Placeholder for future detailed parsing of type parameters
-                    'constraints': [] # Placeholder for future detailed parsing of constraints
-                })
-        return columns
+        """Parse column definitions from the text within table parentheses."""
+        return parse_columns(columns_text)
     
     def _split_column_definitions(self, columns_text: str) -> List[str]:
         """Split column definitions while respecting parentheses."""
-        definitions = []
-        current_def = ""
-        paren_level = 0
-        
-        for char in columns_text:
-            if char == '(':
-                paren_level += 1
-            elif char == ')':
-                paren_level -= 1
-            elif char == ',' and paren_level == 0:
-                if current_def.strip():
-                    definitions.append(current_def.strip())
-                current_def = ""
-                continue
-            
-            current_def += char
-        
-        if current_def.strip():
-            definitions.append(current_def.strip())
-        
-        return definitions
+        return _split_top_level_commas(columns_text)
     
     def _parse_single_column(self, col_def: str) -> Dict[str, Any]:
         """Parse a single column definition."""
@@ -210,7 +330,7 @@ class SchemaParser:
     def _extract_data_type_and_size(self, data_type_part: str) -> tuple:
         """Extract data type and size from type definition."""
         # Handle types like VARCHAR(255), DECIMAL(10,2), etc.
-        match = re.match(r'([a-zA-Z]+)(?:\(([^)]+)\))?', data_type_part)
+        match = DATA_TYPE_SIZE_RE.match(data_type_part)
         if match:
             data_type = match.group(1).lower()
             size_part = match.group(2)
@@ -236,22 +356,13 @@ class SchemaParser:
         constraints = []
         upper_text = type_and_constraints.upper()
         
-        constraint_patterns = [
-            ('NOT NULL', 'not_null'),
-            ('PRIMARY KEY', 'primary_key'),
-            ('UNIQUE', 'unique'),
-            ('AUTO_INCREMENT', 'auto_increment'),
-            ('IDENTITY', 'auto_increment'),
-            ('DEFAULT', 'default')
-        ]
-        
-        for pattern, constraint in constraint_patterns:
+        for pattern, constraint in CONSTRAINT_PATTERNS:
             if pattern in upper_text:
                 constraints.append(constraint)
                 
                 # Extract default value if present
                 if constraint == 'default':
-                    default_match = re.search(r'DEFAULT\s+([^,\s]+)', upper_text)
+                    default_match = DEFAULT_VALUE_RE.search(upper_text)
                     if default_match:
                         constraints.append(f"default_value:{default_match.group(1)}")
         
@@ -0,0 +1,127 @@
+import functools
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+# Location of the on-disk response cache; override with GENSQL66_LLM_CACHE.
+DEFAULT_CACHE_PATH = os.environ.get("GENSQL66_LLM_CACHE", ".llm_cache.sqlite3")
+# Entries older than this are treated as misses so model updates eventually show through
+DEFAULT_TTL_SECONDS = 7 * 24 * 60 * 60
+
+class LLMResponseCache:
+    """Disk-backed store of raw LLM responses keyed by prompt and generation settings."""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl: float = DEFAULT_TTL_SECONDS):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key TEXT PRIMARY KEY, response TEXT NOT NULL, created_at REAL NOT NULL DEFAULT 0)"
+            )
+            try:
+                # Caches written before entries expired lack the timestamp; their rows count as expired
+                self._conn.execute("ALTER TABLE responses ADD COLUMN created_at REAL NOT NULL DEFAULT 0")
+            except sqlite3.OperationalError:
+                pass
+            self._conn.commit()
+
+    @staticmethod
+    def make_key(**parts: Any) -> str:
+        """
+        Build a stable cache key from the pieces that determine an LLM response.
+
+        Args:
+            parts: Model name, rendered prompt and sampling settings
+
+        Returns:
+            Hex digest identifying the request
+        """
+        payload = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for key, or None on a miss or an expired entry."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response FROM responses WHERE key = ? AND created_at >= ?",
+                (key, time.time() - self.ttl)
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, response: str) -> None:
+        """Store a response under key, replacing any previous entry."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, created_at) VALUES (?, ?, ?)",
+                (key, response, time.time())
+            )
+            self._conn.commit()
+
+    def invalidate(self, key: Optional[str] = None) -> int:
+        """
+        Drop cached responses.
+
+        Args:
+            key: Entry to drop; drops every entry when None
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            if key is None:
+                cursor = self._conn.execute("DELETE FROM responses")
+            else:
+                cursor = self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._conn.commit()
+        return cursor.rowcount
+
+    def lookup(self, model: str, prompt: str, settings: Dict[str, Any]) -> Optional[str]:
+        """Return the cached response for an LLM request, or None on a miss."""
+        return self.get(self.make_key(model=model, prompt=prompt, **settings))
+
+    def store(self, model: str, prompt: str, settings: Dict[str, Any], response: Optional[str]) -> None:
+        """
+        Cache the response to an LLM request.
+
+        Empty responses are skipped so that transient failures are retried.
+
+        Args:
+            model: Model ID the request was sent to
+            prompt: Fully rendered prompt
+            settings: Sampling settings of the request
+            response: Response text returned by the model
+        """
+        if response:
+            self.set(self.make_key(model=model, prompt=prompt, **settings), response)
+
+@functools.lru_cache(maxsize=1)
+def get_response_cache() -> LLMResponseCache:
+    """Return the process-wide response cache, opening it on first use."""
+    return LLMResponseCache()
+
+def cached_response(func: Callable[..., Optional[str]]) -> Callable[..., Optional[str]]:
+    """
+    Cache the text returned by an LLM call.
+
+    The wrapped method must take (model, prompt, settings) and return the response
+    text. Empty responses are not cached so that transient failures are retried.
+    """
+    @functools.wraps(func)
+    def wrapper(self, model: str, prompt: str, settings: Dict[str, Any]) -> Optional[str]:
+        cache = get_response_cache()
+        cached = cache.lookup(model, prompt, settings)
+        if cached is not None:
+            return cached
+
+        response_text = func(self, model, prompt, settings)
+        cache.store(model, prompt, settings, response_text)
+        return response_text
+
+    return wrapper
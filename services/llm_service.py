@@ -1,10 +1,103 @@
 import streamlit as st
 from google import genai
 from google.genai import types
+import asyncio
+import functools
+import hashlib
+import httpx
+import json
 import os
-from typing import Dict, Any, Optional, Tuple
+import uuid
+from collections import Counter
+from typing import Callable, Dict, Any, List, Optional, Tuple
 import re
 from config.llm_config import LLMConfig
+from services.llm_cache import cached_response, get_response_cache
+from services.semantic_cache import get_suggestion_cache
+
+# Markdown fences in model output: an opening ```sql at the very start, or any bare ```
+CODE_FENCE_RE = re.compile(r"^\s*```sql|```", re.IGNORECASE)
+# Whitespace other than the newline itself on either side of a line break
+LINE_EDGE_WHITESPACE_RE = re.compile(r"[^\S\n]*\n[^\S\n]*")
+# A line whose first non-blank characters are not a -- comment
+STATEMENT_LINE_RE = re.compile(r"^[^\S\n]*(?!--)\S", re.MULTILINE)
+# SQL constructs counted when validating a converted schema, by construct name
+CONSTRUCT_KEYWORDS = {
+    'tables': r'CREATE\s+TABLE',
+    'views': r'CREATE\s+VIEW',
+    'functions': r'CREATE\s+FUNCTION',
+    'procedures': r'CREATE\s+PROCEDURE',
+    'triggers': r'CREATE\s+TRIGGER',
+    'indexes': r'CREATE\s+INDEX',
+    'databases': r'CREATE\s+DATABASE',
+    'alter_statements': r'ALTER\s',
+    'insert_statements': r'INSERT\s+INTO',
+    'update_statements': r'UPDATE\s',
+    'delete_statements': r'DELETE\s+FROM',
+    'select_statements': r'SELECT\s'
+}
+# Constructs that SchemaParser cannot turn into data; ALTER and CREATE INDEX are tolerated
+NON_TABLE_CONSTRUCTS = frozenset({
+    'views', 'functions', 'procedures', 'triggers', 'databases',
+    'insert_statements', 'update_statements', 'delete_statements', 'select_statements'
+})
+CONSTRUCT_RE = re.compile(
+    r"\b(?:" + "|".join(f"(?P<{name}>{pattern})" for name, pattern in CONSTRUCT_KEYWORDS.items()) + ")",
+    re.IGNORECASE
+)
+
+# Connection pool limits for the shared Vertex AI client
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=50)
+# GCS location (gs://bucket/prefix) for batch suggestion jobs; override with GENSQL66_BATCH_GCS_PREFIX.
+DEFAULT_BATCH_GCS_PREFIX = os.environ.get("GENSQL66_BATCH_GCS_PREFIX", "")
+# Batch states after which a job will not change any more
+_BATCH_DONE_STATES = {
+    "JOB_STATE_SUCCEEDED", "JOB_STATE_PARTIALLY_SUCCEEDED",
+    "JOB_STATE_FAILED", "JOB_STATE_CANCELLED", "JOB_STATE_EXPIRED"
+}
+
+def schema_digest(schema: str) -> str:
+    """Stable identifier for a schema, used to key batch results."""
+    return hashlib.blake2b(schema.encode("utf-8"), digest_size=16).hexdigest()
+
+def _storage_client():
+    """Return a Cloud Storage client; google-cloud-storage is only needed for batch jobs."""
+    try:
+        from google.cloud import storage
+    except ImportError as e:
+        raise ImportError("Batch suggestions require google-cloud-storage (pip install google-cloud-storage)") from e
+    return storage.Client(project="ai-ml-team-sandbox")
+
+def _split_gcs_uri(uri: str) -> Tuple[str, str]:
+    """Split gs://bucket/path into (bucket, path)."""
+    bucket, _, path = uri[len("gs://"):].partition("/")
+    return bucket, path.rstrip("/")
+
+@functools.lru_cache(maxsize=1)
+def get_vertex_client() -> genai.Client:
+    """
+    Return the process-wide Vertex AI client.
+    
+    Credentials are read and the client is built once. lru_cache does not store
+    exceptions, so a failed attempt is retried when get_llm_service rebuilds the
+    unconfigured service on the next rerun.
+    """
+    # Set up Vertex AI environment
+    os.environ["GOOGLE_GENAI_USE_VERTEXAI"] = "true"
+    os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = "ai-ml-team-sandbox-f9080a491656.json"
+    
+    # Create Vertex AI client. Its HTTP connection pools are shared by every request,
+    # so keep enough idle connections for concurrent sessions and batch conversions.
+    return genai.Client(
+        vertexai=True,
+        project="ai-ml-team-sandbox",  # Extracted from your JSON filename
+        location="us-central1",
+        http_options=types.HttpOptions(
+            client_args={"limits": HTTP_LIMITS},
+            async_client_args={"limits": HTTP_LIMITS},
+            retry_options=types.HttpRetryOptions(attempts=3)
+        )
+    )
 
 class LLMService:
     """Service class for handling LLM interactions using google-genai with Vertex AI."""
@@ -22,16 +115,7 @@ class LLMService:
             True if configuration successful, False otherwise
         """
         try:
-            # Set up Vertex AI environment
-            os.environ["GOOGLE_GENAI_USE_VERTEXAI"] = "true"
-            os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = "ai-ml-team-sandbox-f9080a491656.json"
-            
-            # Create Vertex AI client
-            self.client = genai.Client(
-                vertexai=True,
-                project="ai-ml-team-sandbox",  # Extracted from your JSON filename
-                location="us-central1"
-            )
+            self.client = get_vertex_client()
             self.is_configured = True
             return True
         except Exception as e:
@@ -70,7 +154,8 @@ class LLMService:
         except Exception as e:
             return False, f"Connection failed: {str(e)}"
     
-    def convert_schema(self, input_schema: str, output_format: str, model_config: Dict[str, Any]) -> Tuple[bool, str, str, bool, Dict[str, int]]:
+    def convert_schema(self, input_schema: str, output_format: str, model_config: Dict[str, Any],
+                       on_text: Optional[Callable[[str], None]] = None) -> Tuple[bool, str, str, bool, Dict[str, int]]:
         """
         Convert input schema to proper SQL format using LLM.
         
@@ -78,6 +163,8 @@ class LLMService:
             input_schema: Raw schema input from user
             output_format: The target SQL dialect (e.g., "MySQL", "PostgreSQL")
             model_config: Model configuration dictionary
+            on_text: If given, the response is streamed and this is called with the
+                     text received so far; validation runs once the stream ends
             
         Returns:
             Tuple of (success, 
@@ -93,61 +180,232 @@ class LLMService:
             # Validate configuration
             validated_config = LLMConfig.validate_config(model_config)
             
-            # Create the prompt
-            prompt = LLMConfig.SCHEMA_CONVERSION_PROMPT.format(input_schema_or_sql=input_schema, output_format=output_format)
+            # Create the prompt: static dialect instructions go in the system instruction so
+            # the model's prompt-prefix cache can reuse them; only the schema varies
+            system_instruction, prompt = LLMConfig.render_prompt_parts(output_format, input_schema)
             
-            # Generate content using Vertex AI
-            generation_config = types.GenerateContentConfig(
-                temperature=validated_config["temperature"],
-                max_output_tokens=validated_config["max_output_tokens"],
-                top_p=validated_config["top_p"],
-                top_k=validated_config["top_k"]
-            )
+            # Generate content using Vertex AI (served from the response cache when possible)
+            settings = self._generation_settings(validated_config, system_instruction)
+            if on_text:
+                response_text = self._generate_text_stream(validated_config["model"], prompt, settings, on_text)
+            else:
+                response_text = self._generate_text(validated_config["model"], prompt, settings)
             
-            response = self.client.models.generate_content(
-                model=validated_config["model"],
-                contents=prompt,
-                config=generation_config
+            if response_text:
+                return self._finish_conversion(response_text, output_format)
+            else:
+                return False, "", "No response received from the model.", False, {}
+                
+        except Exception as e:
+            return False, "", f"Schema conversion failed: {str(e)}", False, {}
+    
+    async def aconvert_schema(self, input_schema: str, output_format: str, model_config: Dict[str, Any],
+                              on_text: Optional[Callable[[str], None]] = None) -> Tuple[bool, str, str, bool, Dict[str, int]]:
+        """
+        Async, streaming variant of convert_schema.
+        
+        The shared client's async connection pool is bound to the event loop that
+        first uses it, so await this from one long-lived loop rather than a fresh
+        asyncio.run per call; Streamlit pages use convert_schema(on_text=...).
+        
+        Args:
+            input_schema: Raw schema input from user
+            output_format: The target SQL dialect (e.g., "MySQL", "PostgreSQL")
+            model_config: Model configuration dictionary
+            on_text: Called with the response text received so far as chunks arrive
+            
+        Returns:
+            Same tuple as convert_schema
+        """
+        if not self.is_configured:
+            return False, "", "Vertex AI client not configured properly.", False, {}
+        
+        try:
+            validated_config = LLMConfig.validate_config(model_config)
+            system_instruction, prompt = LLMConfig.render_prompt_parts(output_format, input_schema)
+            
+            response_text = await self._agenerate_text_stream(
+                validated_config["model"], prompt,
+                self._generation_settings(validated_config, system_instruction), on_text
             )
             
-            if response and response.text:
-                cleaned_schema_content = self._clean_schema_response(response.text)
-                schema_with_dialect = f"{output_format}\n{cleaned_schema_content}"
-                
-                # Correctly unpack the 3 values from _validate_converted_schema
-                is_valid, validation_message, construct_counts = self._validate_converted_schema(schema_with_dialect)
-                # The line below is removed as construct_counts is now received from the validation:
-                # construct_counts = {}  # Since _validate_converted_schema does not return construct_counts
-
-                # Determine suitability for data generation
-                # Suitable if it has tables and no other major DDL/DML that SchemaParser won't handle.
-                tables_found = construct_counts.get('tables', 0) > 0
-                other_major_constructs = sum(
-                    construct_counts.get(k, 0) for k in [
-                        'views', 'functions', 'procedures', 'triggers', 'databases',
-                        'insert_statements', 'update_statements', 'delete_statements',
-                        'select_statements' # Exclude SELECT as data generator focuses on table structure
-                        # 'alter_statements' could be debatable; for now, consider them as making it less straightforward
-                    ]
-                )
-                # Allow alter statements if they are the only other thing besides tables,
-                # as they might be adding constraints. This is a heuristic.
-                # A more precise check would analyze the nature of ALTER statements.
-                # For now, let's be strict: only tables, or tables + alters.
-                # Or even stricter: only tables. Let's go with stricter for now for simplicity.
-                
-                is_suitable_for_data_gen = tables_found and other_major_constructs == 0
-
-                if is_valid:
-                    return True, schema_with_dialect, validation_message, is_suitable_for_data_gen, construct_counts
-                else:
-                    return False, schema_with_dialect, f"Schema validation failed: {validation_message}", is_suitable_for_data_gen, construct_counts
+            if response_text:
+                return self._finish_conversion(response_text, output_format)
             else:
                 return False, "", "No response received from the model.", False, {}
                 
         except Exception as e:
             return False, "", f"Schema conversion failed: {str(e)}", False, {}
     
+    async def aconvert_schemas(self, input_schemas: List[str], output_format: str,
+                               model_config: Dict[str, Any]) -> List[Tuple[bool, str, str, bool, Dict[str, int]]]:
+        """
+        Convert several schemas concurrently.
+        
+        Requests are in flight at the same time, so total latency follows the slowest
+        response rather than the sum of all of them.
+        
+        Args:
+            input_schemas: Raw schema inputs
+            output_format: The target SQL dialect (e.g., "MySQL", "PostgreSQL")
+            model_config: Model configuration dictionary
+            
+        Returns:
+            One convert_schema result tuple per input, in input order
+        """
+        return list(await asyncio.gather(*(
+            self.aconvert_schema(input_schema, output_format, model_config)
+            for input_schema in input_schemas
+        )))
+    
+    def _generation_settings(self, validated_config: Dict[str, Any],
+                             system_instruction: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Build GenerateContentConfig keyword arguments from a validated model config.
+        
+        Args:
+            validated_config: Output of LLMConfig.validate_config
+            system_instruction: Static instructions sent ahead of the prompt, if any
+            
+        Returns:
+            Settings dict, also used as part of the response cache key
+        """
+        settings = {
+            "temperature": validated_config["temperature"],
+            "max_output_tokens": validated_config["max_output_tokens"],
+            "top_p": validated_config["top_p"],
+            "top_k": validated_config["top_k"]
+        }
+        if system_instruction:
+            settings["system_instruction"] = system_instruction
+        return settings
+    
+    def _finish_conversion(self, response_text: str, output_format: str) -> Tuple[bool, str, str, bool, Dict[str, int]]:
+        """
+        Clean, validate and classify a schema conversion response.
+        
+        Args:
+            response_text: Raw response from the model
+            output_format: The target SQL dialect, prefixed to the cleaned schema
+            
+        Returns:
+            Same tuple as convert_schema
+        """
+        cleaned_schema_content = self._clean_schema_response(response_text)
+        schema_with_dialect = f"{output_format}\n{cleaned_schema_content}"
+        
+        # Correctly unpack the 3 values from _validate_converted_schema
+        is_valid, validation_message, construct_counts = self._validate_converted_schema(schema_with_dialect)
+        # The line below is removed as construct_counts is now received from the validation:
+        # construct_counts = {}  # Since _validate_converted_schema does not return construct_counts
+
+        # Determine suitability for data generation
+        # Suitable if it has tables and no other major DDL/DML that SchemaParser won't handle.
+        # construct_counts only holds constructs that were found, so this is a key check.
+        tables_found = 'tables' in construct_counts
+        other_major_constructs = not NON_TABLE_CONSTRUCTS.isdisjoint(construct_counts)
+        # Allow alter statements if they are the only other thing besides tables,
+        # as they might be adding constraints. This is a heuristic.
+        # A more precise check would analyze the nature of ALTER statements.
+        # For now, let's be strict: only tables, or tables + alters.
+        # Or even stricter: only tables. Let's go with stricter for now for simplicity.
+        
+        is_suitable_for_data_gen = tables_found and not other_major_constructs
+
+        if is_valid:
+            return True, schema_with_dialect, validation_message, is_suitable_for_data_gen, construct_counts
+        else:
+            return False, schema_with_dialect, f"Schema validation failed: {validation_message}", is_suitable_for_data_gen, construct_counts
+    
+    @cached_response
+    def _generate_text(self, model: str, prompt: str, settings: Dict[str, Any]) -> Optional[str]:
+        """
+        Send a prompt to the model and return the response text.
+        
+        Args:
+            model: Model ID to use
+            prompt: Fully rendered prompt
+            settings: GenerateContentConfig keyword arguments
+            
+        Returns:
+            Response text, or None if the model returned nothing
+        """
+        response = self.client.models.generate_content(
+            model=model,
+            contents=prompt,
+            config=types.GenerateContentConfig(**settings)
+        )
+        return response.text if response else None
+    
+    def _generate_text_stream(self, model: str, prompt: str, settings: Dict[str, Any],
+                              on_text: Callable[[str], None]) -> Optional[str]:
+        """
+        Stream a response from the model, sharing the response cache with _generate_text.
+        
+        Args:
+            model: Model ID to use
+            prompt: Fully rendered prompt
+            settings: GenerateContentConfig keyword arguments
+            on_text: Called with the response text received so far
+            
+        Returns:
+            Full response text, or None if the model returned nothing
+        """
+        cache = get_response_cache()
+        cached = cache.lookup(model, prompt, settings)
+        if cached is not None:
+            on_text(cached)
+            return cached
+        
+        response_text = ""
+        for chunk in self.client.models.generate_content_stream(
+            model=model,
+            contents=prompt,
+            config=types.GenerateContentConfig(**settings)
+        ):
+            if chunk.text:
+                response_text += chunk.text
+                on_text(response_text)
+        
+        cache.store(model, prompt, settings, response_text)
+        return response_text or None
+    
+    async def _agenerate_text_stream(self, model: str, prompt: str, settings: Dict[str, Any],
+                                     on_text: Optional[Callable[[str], None]] = None) -> Optional[str]:
+        """
+        Stream a response from the model, sharing the response cache with _generate_text.
+        
+        Args:
+            model: Model ID to use
+            prompt: Fully rendered prompt
+            settings: GenerateContentConfig keyword arguments
+            on_text: Called with the response text received so far
+            
+        Returns:
+            Full response text, or None if the model returned nothing
+        """
+        cache = get_response_cache()
+        cached = cache.lookup(model, prompt, settings)
+        if cached is not None:
+            if on_text:
+                on_text(cached)
+            return cached
+        
+        response_text = ""
+        stream = await self.client.aio.models.generate_content_stream(
+            model=model,
+            contents=prompt,
+            config=types.GenerateContentConfig(**settings)
+        )
+        async for chunk in stream:
+            if chunk.text:
+                response_text += chunk.text
+                if on_text:
+                    on_text(response_text)
+        
+        cache.store(model, prompt, settings, response_text)
+        return response_text or None
+    
     def _clean_schema_response(self, response_text: str) -> str:
         """
         Clean and format the LLM response to extract SQL statements.
@@ -159,23 +417,12 @@ class LLMService:
         Returns:
             Cleaned SQL schema
         """
-        # Remove markdown code blocks if present
-        # Remove ```sql at the beginning
-        cleaned_text = re.sub(r'^\s*```sql\s*\n?', '', response_text, flags=re.IGNORECASE)
-        # Remove ``` at the end
-        cleaned_text = re.sub(r'\n?\s*```\s*$', '', cleaned_text)
-        # Remove any other ```
-        cleaned_text = cleaned_text.replace('```', '')
+        # Remove markdown code blocks if present: a leading ```sql and any other ```
+        cleaned_text = CODE_FENCE_RE.sub('', response_text)
         
-        # Remove leading/trailing whitespace from the whole text and from each line
-        lines = [line.strip() for line in cleaned_text.split('\n')]
-        # Filter out empty lines that might result from stripping, but preserve structure
-        # For example, don't collapse multiple intentional blank lines between statements if any.
-        # However, for simplicity here, we'll just join them back.
-        # If the LLM is instructed to only output SQL, extensive cleaning of non-SQL lines shouldn't be needed.
-        
-        # Rejoin lines and strip overall whitespace
-        cleaned_schema = '\n'.join(lines).strip()
+        # Remove leading/trailing whitespace from each line (whitespace around every
+        # newline) and from the whole text, without splitting into a list of lines
+        cleaned_schema = LINE_EDGE_WHITESPACE_RE.sub('\n', cleaned_text).strip()
         
         return cleaned_schema
     
@@ -191,28 +438,21 @@ class LLMService:
         Returns:
             Tuple of (is_valid, validation_message, construct_counts)
         """
-        lines = schema_text_with_dialect.strip().split('\n')
+        # Split off the dialect line without building a list of every line
+        dialect, _, schema_content = schema_text_with_dialect.strip().partition('\n')
         construct_counts = {} # Initialize here
 
-        if not lines:
-            return False, "Empty schema input (no dialect or content provided)", construct_counts
-
-        dialect = lines[0].strip()
+        dialect = dialect.strip()
         if not dialect: # Ensure dialect line is not empty
             return False, "Dialect not specified or empty on the first line.", construct_counts
 
-        schema_content = '\n'.join(lines[1:]).strip()
+        schema_content = schema_content.strip()
 
         if not schema_content:
             return False, f"Empty schema content (Dialect: {dialect})", construct_counts
         
-        schema_upper = schema_content.upper()
-        
-        # Handle schemas that are only comments
-        schema_no_comments_for_activity_check = "\n".join(
-            [line for line in schema_content.split('\n') if not line.strip().startswith('--')]
-        )
-        if not schema_no_comments_for_activity_check.strip() and schema_content.strip().startswith('--'):
+        # Handle schemas that are only comments; the search stops at the first line with a statement
+        if not STATEMENT_LINE_RE.search(schema_content) and schema_content.startswith('--'):
             return True, f"Schema (Dialect: {dialect}) contains only comments and is considered valid.", construct_counts
 
         # --- Basic Syntax Checks ---
@@ -221,28 +461,13 @@ class LLMService:
             return False, f"Validation Error (Dialect: {dialect}): Mismatched parentheses.", construct_counts
         
         # --- Count SQL Constructs ---
-        # construct_counts was initialized earlier
-        keywords_to_count = {
-            'tables': 'CREATE TABLE',
-            'views': 'CREATE VIEW',
-            'functions': 'CREATE FUNCTION',
-            'procedures': 'CREATE PROCEDURE',
-            'triggers': 'CREATE TRIGGER',
-            'indexes': 'CREATE INDEX',
-            'databases': 'CREATE DATABASE', 
-            'alter_statements': 'ALTER ', 
-            'insert_statements': 'INSERT INTO',
-            'update_statements': 'UPDATE ', 
-            'delete_statements': 'DELETE FROM',
-            'select_statements': 'SELECT ' 
-        }
-
-        found_any_construct = False
-        for construct_name, keyword in keywords_to_count.items():
-            count = schema_upper.count(keyword)
-            if count > 0:
-                construct_counts[construct_name] = count # Use direct assignment
-                found_any_construct = True
+        # One scan over the text; named groups say which construct matched
+        counts = Counter(match.lastgroup for match in CONSTRUCT_RE.finditer(schema_content))
+        # Report constructs in CONSTRUCT_KEYWORDS order regardless of where they appear
+        for construct_name in CONSTRUCT_KEYWORDS:
+            if counts[construct_name]:
+                construct_counts[construct_name] = counts[construct_name]
+        found_any_construct = bool(construct_counts)
         
         if not found_any_construct and not schema_content.strip().startswith('--'): # if not just comments
              return False, f"Validation Error (Dialect: {dialect}): No common SQL DDL/DML keywords (CREATE, INSERT, SELECT, etc.) detected.", construct_counts
@@ -268,13 +493,16 @@ class LLMService:
         return True, validation_message, construct_counts
         
     
-    def get_improvement_suggestions(self, schema: str, model_config: Dict[str, Any]) -> Tuple[bool, str]:
+    def get_improvement_suggestions(self, schema: str, model_config: Dict[str, Any],
+                                    on_text: Optional[Callable[[str], None]] = None) -> Tuple[bool, str]:
         """
         Get improvement suggestions for a schema.
         
         Args:
             schema: SQL schema to analyze
             model_config: Model configuration dictionary
+            on_text: If given, the response is streamed and this is called with the
+                     text received so far
             
         Returns:
             Tuple of (success, suggestions)
@@ -283,34 +511,174 @@ class LLMService:
             return False, "Vertex AI client not configured."
         
         try:
-            improvement_prompt = f"""
-Analyze the following SQL schema and provide improvement suggestions:
-
-{schema}
-
-Please provide:
-1. Missing indexes that should be added
-2. Missing constraints or relationships
-3. Data type optimizations
-4. Naming convention improvements
-5. Performance optimization suggestions
-
-Keep suggestions concise and practical.
-"""
+            model = LLMConfig.validate_config(model_config)["model"]
             
-            response = self.client.models.generate_content(
-                model=model_config["model"],
-                contents=improvement_prompt,
-                config=types.GenerateContentConfig(
-                    temperature=0.3,
-                    max_output_tokens=1000
-                )
-            )
+            # Near-identical schemas (whitespace, comment or tiny edits) reuse earlier suggestions
+            cached = get_suggestion_cache().get(schema, namespace=model)
+            if cached is not None:
+                if on_text:
+                    on_text(cached)
+                return True, cached
             
-            if response and response.text:
-                return True, response.text
+            if on_text:
+                response_text = ""
+                for chunk in self.client.models.generate_content_stream(
+                    model=model,
+                    contents=f"SQL schema:\n\n{schema}",
+                    config=self._suggestion_config()
+                ):
+                    if chunk.text:
+                        response_text += chunk.text
+                        on_text(response_text)
             else:
-                return False, "No suggestions received."
+                response = self.client.models.generate_content(
+                    model=model,
+                    contents=f"SQL schema:\n\n{schema}",
+                    config=self._suggestion_config()
+                )
+                response_text = response.text if response else None
+            return self._finish_suggestions(schema, model, response_text)
+                
+        except Exception as e:
+            return False, f"Failed to generate suggestions: {str(e)}"
+    
+    async def aget_improvement_suggestions(self, schema: str, model_config: Dict[str, Any]) -> Tuple[bool, str]:
+        """
+        Async variant of get_improvement_suggestions.
+        
+        Args:
+            schema: SQL schema to analyze
+            model_config: Model configuration dictionary
+            
+        Returns:
+            Tuple of (success, suggestions)
+        """
+        if not self.is_configured:
+            return False, "Vertex AI client not configured."
+        
+        try:
+            model = LLMConfig.validate_config(model_config)["model"]
+            
+            cached = get_suggestion_cache().get(schema, namespace=model)
+            if cached is not None:
+                return True, cached
+            
+            response = await self.client.aio.models.generate_content(
+                model=model,
+                contents=f"SQL schema:\n\n{schema}",
+                config=self._suggestion_config()
+            )
+            return self._finish_suggestions(schema, model, response.text if response else None)
                 
         except Exception as e:
-            return False, f"Failed to generate suggestions: {str(e)}"
\ No newline at end of file
+            return False, f"Failed to generate suggestions: {str(e)}"
+    
+    def submit_batch_suggestions(self, schemas: List[str], model_config: Dict[str, Any],
+                                 gcs_prefix: str = DEFAULT_BATCH_GCS_PREFIX) -> str:
+        """
+        Queue improvement suggestions for many schemas as one Vertex AI batch job.
+        
+        Batch jobs are billed at a lower rate than online requests but finish
+        asynchronously; collect the results with poll_batch.
+        
+        Args:
+            schemas: SQL schemas to analyze
+            model_config: Model configuration dictionary
+            gcs_prefix: gs:// location for the job's input and output files
+            
+        Returns:
+            Batch job name to pass to poll_batch
+        """
+        if not self.is_configured:
+            raise RuntimeError("Vertex AI client not configured.")
+        if not gcs_prefix.startswith("gs://"):
+            raise ValueError("A gs:// prefix is required for batch jobs (set GENSQL66_BATCH_GCS_PREFIX).")
+        
+        suggestion_config = self._suggestion_config()
+        lines = [
+            json.dumps({"request": {
+                "contents": [{"role": "user", "parts": [{"text": f"SQL schema:\n\n{schema}"}]}],
+                "systemInstruction": {"parts": [{"text": suggestion_config.system_instruction}]},
+                "generationConfig": {
+                    "temperature": suggestion_config.temperature,
+                    "maxOutputTokens": suggestion_config.max_output_tokens
+                }
+            }})
+            for schema in schemas
+        ]
+        
+        run_prefix = f"{gcs_prefix.rstrip('/')}/suggestions-{uuid.uuid4().hex}"
+        bucket, path = _split_gcs_uri(run_prefix)
+        _storage_client().bucket(bucket).blob(f"{path}/input.jsonl").upload_from_string(
+            "\n".join(lines), content_type="application/jsonl"
+        )
+        
+        job = self.client.batches.create(
+            model=LLMConfig.validate_config(model_config)["model"],
+            src=f"{run_prefix}/input.jsonl",
+            config=types.CreateBatchJobConfig(dest=f"{run_prefix}/output")
+        )
+        return job.name
+    
+    def poll_batch(self, job_name: str, model_config: Dict[str, Any]) -> Optional[Dict[str, str]]:
+        """
+        Collect the results of a batch job started by submit_batch_suggestions.
+        
+        Args:
+            job_name: Name returned by submit_batch_suggestions
+            model_config: Model configuration the job was submitted with
+            
+        Returns:
+            Mapping of schema_digest(schema) to suggestions once the job has finished,
+            or None while it is still running. Results also fill the suggestion cache.
+        """
+        job = self.client.batches.get(name=job_name)
+        state = job.state.value if hasattr(job.state, "value") else str(job.state)
+        if state not in _BATCH_DONE_STATES:
+            return None
+        if state not in ("JOB_STATE_SUCCEEDED", "JOB_STATE_PARTIALLY_SUCCEEDED"):
+            raise RuntimeError(f"Batch job {job_name} ended in state {state}")
+        
+        results = {}
+        model = LLMConfig.validate_config(model_config)["model"]
+        suggestion_cache = get_suggestion_cache()
+        bucket, path = _split_gcs_uri(job.dest.gcs_uri)
+        for blob in _storage_client().list_blobs(bucket, prefix=path):
+            if not blob.name.endswith(".jsonl"):
+                continue
+            for line in blob.download_as_text().splitlines():
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                try:
+                    prompt = record["request"]["contents"][0]["parts"][0]["text"]
+                    text = record["response"]["candidates"][0]["content"]["parts"][0]["text"]
+                except (KeyError, IndexError, TypeError):
+                    continue  # Failed rows carry a status instead of a response
+                schema = prompt.split("\n\n", 1)[-1]
+                results[schema_digest(schema)] = text
+                suggestion_cache.set(schema, text, namespace=model)
+        return results
+    
+    def _suggestion_config(self) -> types.GenerateContentConfig:
+        """Generation settings for improvement suggestions."""
+        return types.GenerateContentConfig(
+            system_instruction=LLMConfig.IMPROVEMENT_SYSTEM_PROMPT,
+            temperature=0.3,
+            max_output_tokens=1000
+        )
+    
+    def _finish_suggestions(self, schema: str, model: str,
+                            response_text: Optional[str]) -> Tuple[bool, str]:
+        """Store a suggestions response in the suggestion cache and build the result tuple."""
+        if response_text:
+            get_suggestion_cache().set(schema, response_text, namespace=model)
+            return True, response_text
+        else:
+            return False, "No suggestions received."
+
+# An unconfigured service fails validation, so the next call builds it again
+@st.cache_resource(show_spinner=False, validate=lambda service: service.is_configured)
+def get_llm_service() -> LLMService:
+    """Return the process-wide LLMService shared by all sessions."""
+    return LLMService()
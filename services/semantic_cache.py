@@ -0,0 +1,166 @@
+import functools
+import os
+import re
+import tempfile
+import threading
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from schema_parser import COMMENT_RE
+
+# Size of the hashed character n-gram vectors used by the default embedding
+EMBEDDING_DIM = 1024
+_WHITESPACE_RE = re.compile(r"\s+")
+# Location of the persisted suggestion cache; override with GENSQL66_SUGGESTION_CACHE.
+DEFAULT_CACHE_PATH = os.environ.get("GENSQL66_SUGGESTION_CACHE", ".suggestion_cache.npz")
+
+def normalize_schema(schema: str) -> str:
+    """Strip comments, collapse whitespace and lower-case a schema so trivial edits collide."""
+    return _WHITESPACE_RE.sub(" ", COMMENT_RE.sub(r"\1", schema)).strip().lower()
+
+def hashed_ngram_embedding(text: str, dim: int = EMBEDDING_DIM) -> np.ndarray:
+    """
+    Embed text as an L2-normalized histogram of hashed character trigrams.
+
+    A cheap, dependency-free stand-in for a sentence embedding: schemas that share
+    almost all of their trigrams score a cosine similarity close to 1.
+
+    Args:
+        text: Normalized text to embed
+        dim: Number of hash buckets
+
+    Returns:
+        float32 vector of length dim
+    """
+    codes = np.frombuffer(text.encode("utf-8"), dtype=np.uint8).astype(np.uint32)
+    vector = np.zeros(dim, dtype=np.float32)
+    if len(codes) < 3:
+        return vector
+
+    trigrams = (codes[:-2] << 16) | (codes[1:-1] << 8) | codes[2:]
+    # Multiplicative hashing spreads neighbouring trigram codes across buckets
+    buckets = (trigrams * np.uint32(2654435761)) % np.uint32(dim)
+    vector += np.bincount(buckets, minlength=dim).astype(np.float32)
+
+    norm = np.linalg.norm(vector)
+    if norm > 0:
+        vector /= norm
+    return vector
+
+class SemanticCache:
+    """In-memory cache that returns a stored response for inputs similar to a previous one."""
+
+    def __init__(self, capacity: int = 256, threshold: float = 0.95,
+                 embed: Callable[[str], np.ndarray] = hashed_ngram_embedding,
+                 dim: int = EMBEDDING_DIM, path: Optional[str] = None):
+        self.capacity = capacity
+        self.path = path
+        self.threshold = threshold
+        self._embed = embed
+        self._lock = threading.Lock()
+        # One row per entry; rows past _size are unused
+        self._vectors = np.zeros((capacity, dim), dtype=np.float32)
+        self._namespaces = np.full(capacity, -1, dtype=np.int32)
+        self._last_used = np.zeros(capacity, dtype=np.int64)
+        self._responses: List[Optional[str]] = [None] * capacity
+        self._namespace_ids: Dict[str, int] = {}
+        self._size = 0
+        self._clock = 0
+        if path and os.path.exists(path):
+            self._load(path)
+
+    def _vector(self, text: str) -> np.ndarray:
+        return self._embed(normalize_schema(text))
+
+    def get(self, text: str, namespace: str = "") -> Optional[str]:
+        """
+        Return the response stored for the most similar input, if it is similar enough.
+
+        Args:
+            text: Input schema
+            namespace: Separates entries that must never be shared, e.g. per model
+
+        Returns:
+            Cached response, or None on a miss
+        """
+        query = self._vector(text)
+        with self._lock:
+            namespace_id = self._namespace_ids.get(namespace)
+            if namespace_id is None or self._size == 0:
+                return None
+
+            scores = self._vectors[:self._size] @ query
+            scores[self._namespaces[:self._size] != namespace_id] = -1.0
+            best = int(np.argmax(scores))
+            if scores[best] < self.threshold:
+                return None
+
+            self._clock += 1
+            self._last_used[best] = self._clock
+            return self._responses[best]
+
+    def set(self, text: str, response: str, namespace: str = "") -> None:
+        """Store a response, evicting the least recently used entry when full."""
+        vector = self._vector(text)
+        with self._lock:
+            namespace_id = self._namespace_ids.setdefault(namespace, len(self._namespace_ids))
+            if self._size < self.capacity:
+                slot = self._size
+                self._size += 1
+            else:
+                slot = int(np.argmin(self._last_used))
+
+            self._clock += 1
+            self._vectors[slot] = vector
+            self._namespaces[slot] = namespace_id
+            self._last_used[slot] = self._clock
+            self._responses[slot] = response
+            if self.path:
+                self._save(self.path)
+
+    def _save(self, path: str) -> None:
+        """Write the cache to path; the caller holds the lock."""
+        namespaces = sorted(self._namespace_ids, key=self._namespace_ids.get)
+        # Write to a temporary file and swap it in so readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".npz")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(
+                    f,
+                    vectors=self._vectors[:self._size],
+                    namespaces=self._namespaces[:self._size],
+                    last_used=self._last_used[:self._size],
+                    responses=np.array(self._responses[:self._size], dtype=str),
+                    namespace_names=np.array(namespaces, dtype=str)
+                )
+            os.replace(tmp_path, path)
+        except OSError:
+            # Persistence is best effort; the in-memory cache keeps working
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _load(self, path: str) -> None:
+        """Restore entries saved by _save, ignoring files that do not fit this cache."""
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                vectors = data["vectors"]
+                if vectors.ndim != 2 or vectors.shape[1] != self._vectors.shape[1]:
+                    return
+                # Keep the most recently used entries if capacity shrank
+                keep = np.argsort(data["last_used"])[::-1][:self.capacity]
+                size = len(keep)
+                self._vectors[:size] = vectors[keep]
+                self._namespaces[:size] = data["namespaces"][keep]
+                self._last_used[:size] = data["last_used"][keep]
+                self._responses[:size] = [str(r) for r in data["responses"][keep]]
+                self._namespace_ids = {str(name): i for i, name in enumerate(data["namespace_names"])}
+                self._size = size
+                self._clock = int(self._last_used[:size].max()) if size else 0
+        except (OSError, KeyError, ValueError):
+            pass
+
+@functools.lru_cache(maxsize=1)
+def get_suggestion_cache() -> SemanticCache:
+    """Return the process-wide cache of schema improvement suggestions, restored from disk."""
+    return SemanticCache(path=DEFAULT_CACHE_PATH)
@@ -1,7 +1,33 @@
 import streamlit as st
 import base64
+import functools
 import io
-from typing import Any
+import re
+import time
+import pandas as pd
+from typing import Any, Iterable, List, Union
+
+# Whitespace runs (collapsed to one underscore) and individual special characters
+_UNSAFE_COLUMN_CHARS_RE = re.compile(r'\s+|[^\w\s]')
+# CREATE TABLE markers checked by validate_schema_content
+_CREATE_TABLE_RE = re.compile(r'CREATE\s+TABLE', re.IGNORECASE)
+_CREATE_TABLE_BYTES_RE = re.compile(rb'CREATE\s+TABLE', re.IGNORECASE)
+# Visualization colors by lower-case data type name
+_DATA_TYPE_COLORS = {
+    'integer': '#FF6B6B',      # Red
+    'float': '#4ECDC4',        # Teal
+    'string': '#45B7D1',       # Blue
+    'date': '#96CEB4',         # Green
+    'datetime': '#FECA57',     # Yellow
+    'boolean': '#FF9FF3',      # Pink
+    'numeric': '#4ECDC4',      # Teal
+    'categorical': '#45B7D1',  # Blue
+}
+# Units used by format_file_size
+_SIZE_NAMES = ("B", "KB", "MB", "GB")
+# Full bar followed by an empty one; create_progress_bar slices a window out of it
+_PROGRESS_BAR_LENGTH = 30
+_PROGRESS_BAR = '█' * _PROGRESS_BAR_LENGTH + '-' * _PROGRESS_BAR_LENGTH
 
 def download_button(label: str, data: Any, file_name: str, mime: str, help: str = None) -> bool:
     """
@@ -25,14 +51,8 @@ def download_button(label: str, data: Any, file_name: str, mime: str, help: str
         help=help
     )
 
-def create_sample_schema() -> str:
-    """
-    Create a sample SQL schema for demonstration.
-    
-    Returns:
-        String containing sample SQL schema
-    """
-    schema = """-- Sample Database Schema for E-commerce Platform
+# Sample schema shown in the app; bound once at import
+SAMPLE_SCHEMA = """-- Sample Database Schema for E-commerce Platform
 -- This is a template showing how to structure your SQL schema
 
 -- Users table
@@ -81,7 +101,15 @@ CREATE TABLE orders (
 -- - Specify VARCHAR lengths for string fields
 -- - Use DECIMAL(precision, scale) for monetary values
 """
-    return schema
+
+def create_sample_schema() -> str:
+    """
+    Create a sample SQL schema for demonstration.
+    
+    Returns:
+        String containing sample SQL schema
+    """
+    return SAMPLE_SCHEMA
 
 def format_file_size(size_bytes: int) -> str:
     """
@@ -96,35 +124,40 @@ def format_file_size(size_bytes: int) -> str:
     if size_bytes == 0:
         return "0 B"
     
-    size_names = ["B", "KB", "MB", "GB"]
-    i = 0
-    while size_bytes >= 1024 and i < len(size_names) - 1:
-        size_bytes /= 1024.0
-        i += 1
-    
-    return f"{size_bytes:.1f} {size_names[i]}"
+    # Each unit is 2**10 times the previous, so the bit length gives the unit directly
+    i = min((int(size_bytes).bit_length() - 1) // 10, len(_SIZE_NAMES) - 1) if size_bytes >= 1024 else 0
+    return f"{size_bytes / (1 << (10 * i)):.1f} {_SIZE_NAMES[i]}"
 
-def validate_schema_content(content: str) -> tuple[bool, str]:
+def validate_schema_content(content: Union[str, bytes]) -> tuple[bool, str]:
     """
     Validate if the content looks like a valid SQL schema.
     
     Args:
-        content: Schema content to validate
+        content: Schema content to validate, as text or raw uploaded bytes
         
     Returns:
         Tuple of (is_valid, error_message)
     """
-    content_upper = content.upper()
+    # Case-insensitive search instead of an upper-cased copy; bytes are checked
+    # without decoding since the markers are all ASCII
+    if isinstance(content, (bytes, bytearray, memoryview)):
+        content = bytes(content) if isinstance(content, memoryview) else content
+        has_create_table = _CREATE_TABLE_BYTES_RE.search(content)
+        open_parens, close_parens = content.count(b'('), content.count(b')')
+    else:
+        has_create_table = _CREATE_TABLE_RE.search(content)
+        open_parens, close_parens = content.count('('), content.count(')')
     
-    if 'CREATE TABLE' not in content_upper:
+    if not has_create_table:
         return False, "No CREATE TABLE statements found in the schema."
     
     # Check for basic SQL syntax
-    if content_upper.count('(') != content_upper.count(')'):
+    if open_parens != close_parens:
         return False, "Mismatched parentheses in the schema."
     
     return True, ""
 
+@functools.lru_cache(maxsize=64)
 def get_data_type_color(data_type: str) -> str:
     """
     Get color for data type visualization.
@@ -135,18 +168,7 @@ def get_data_type_color(data_type: str) -> str:
     Returns:
         Hex color code
     """
-    color_map = {
-        'integer': '#FF6B6B',      # Red
-        'float': '#4ECDC4',        # Teal
-        'string': '#45B7D1',       # Blue
-        'date': '#96CEB4',         # Green
-        'datetime': '#FECA57',     # Yellow
-        'boolean': '#FF9FF3',      # Pink
-        'numeric': '#4ECDC4',      # Teal
-        'categorical': '#45B7D1',  # Blue
-    }
-    
-    return color_map.get(data_type.lower(), '#95A5A6')  # Default gray
+    return _DATA_TYPE_COLORS.get(data_type.lower(), '#95A5A6')  # Default gray
 
 def create_progress_bar(current: int, total: int, prefix: str = "") -> str:
     """
@@ -161,10 +183,14 @@ def create_progress_bar(current: int, total: int, prefix: str = "") -> str:
         Progress bar string
     """
     percentage = int((current / total) * 100) if total > 0 else 0
-    bar_length = 30
+    bar_length = _PROGRESS_BAR_LENGTH
     filled_length = int(bar_length * current // total) if total > 0 else 0
     
-    bar = '█' * filled_length + '-' * (bar_length - filled_length)
+    if 0 <= filled_length <= bar_length:
+        # A window onto the precomputed bar; no per-call string building
+        bar = _PROGRESS_BAR[bar_length - filled_length:2 * bar_length - filled_length]
+    else:
+        bar = '█' * filled_length + '-' * (bar_length - filled_length)
     return f"{prefix} |{bar}| {percentage}% ({current}/{total})"
 
 def safe_column_name(name: str) -> str:
@@ -177,11 +203,8 @@ def safe_column_name(name: str) -> str:
     Returns:
         Safe column name
     """
-    # Remove special characters and replace with underscore
-    import re
-    safe_name = re.sub(r'[^\w\s]', '_', name)
-    safe_name = re.sub(r'\s+', '_', safe_name)
-    safe_name = safe_name.strip('_')
+    # Replace special characters and whitespace with underscores in one pass
+    safe_name = _UNSAFE_COLUMN_CHARS_RE.sub('_', name).strip('_')
     
     # Ensure it doesn't start with a number
     if safe_name and safe_name[0].isdigit():
@@ -189,6 +212,23 @@ def safe_column_name(name: str) -> str:
     
     return safe_name or "unnamed_column"
 
+def safe_column_names(names: Iterable[str]) -> List[str]:
+    """
+    Make many column names safe at once; same rules as safe_column_name.
+    
+    Args:
+        names: Original column names, e.g. DataFrame.columns
+        
+    Returns:
+        Safe column names in the same order
+    """
+    # The pandas string methods loop in C instead of calling the regex once per name
+    safe_names = pd.Series(list(names), dtype="string")
+    safe_names = safe_names.str.replace(_UNSAFE_COLUMN_CHARS_RE, '_', regex=True).str.strip('_')
+    safe_names = safe_names.mask(safe_names.str[:1].str.isdigit(), "col_" + safe_names)
+    safe_names = safe_names.mask(safe_names == "", "unnamed_column")
+    return safe_names.tolist()
+
 def estimate_generation_time(num_samples: int, num_columns: int) -> str:
     """
     Estimate time needed for data generation.
@@ -252,17 +292,31 @@ def display_warning_message(message: str, details: str = None):
 class ProgressTracker:
     """Helper class to track progress across multiple operations."""
     
+    _MIN_REFRESH_SECONDS = 0.1
+    
     def __init__(self, total_steps: int, description: str = "Processing"):
         self.total_steps = total_steps
         self.current_step = 0
         self.description = description
         self.progress_bar = st.progress(0)
         self.status_text = st.empty()
+        # Each widget update is a message to the browser, so refresh at most once per
+        # percent of progress or per _MIN_REFRESH_SECONDS
+        self._last_update_ts = 0.0
+        self._last_pct = -1
         
     def update(self, step_description: str = None):
         """Update progress by one step."""
         self.current_step += 1
         progress = self.current_step / self.total_steps
+        pct = int(100 * progress)
+        now = time.monotonic()
+        if (pct == self._last_pct and self.current_step < self.total_steps
+                and now - self._last_update_ts < self._MIN_REFRESH_SECONDS):
+            return
+        self._last_pct = pct
+        self._last_update_ts = now
+        
         self.progress_bar.progress(progress)
         
         if step_description: